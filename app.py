@@ -1,12 +1,16 @@
 import streamlit as st
-from docx import Document
-from datetime import datetime, timedelta
-import re
-import tempfile
-import os
-from io import BytesIO
-import zipfile
-from lxml import etree
+from datetime import date, timedelta
+from functools import partial
+from overzicht import extraheer_stroom, verzamel
+from pagina import (
+    upload_formulieren, upload_sleutel, upload_hashes, aantal_formulieren, geuploade_formulieren,
+    maak_documenten, toon_dubbelen, toon_downloads, maak_exports, toon_exports, huidige_taak, start_taak, toon_voortgang,
+    start_meting, rond_meting_af, toon_meting,
+)
+from profielen import compileer_profiel
+from resultaat_cache import CACHE_VERSIE, SchijfCache, inhoud_hash
+from docx_extractie import buiten_week
+from observatie_index import ObservatieIndex
 
 # -------------------------------
 # Inloggen met users in secrets
@@ -30,25 +34,115 @@ if "logged_in" not in st.session_state or not st.session_state["logged_in"]:
 
 
 
-def extract_date_picker_fields(docx_path):
-    namespaces = {
-        'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
-    }
+# Op schijf, dus gedeeld door alle sessies en bewaard over een herstart heen
+@st.cache_resource
+def gedeelde_cache():
+    return SchijfCache()
+
+
+# -------------------------------
+# Verwerking (draait als achtergrondtaak, zonder Streamlit)
+# -------------------------------
+def verwerk(profiel, uploaded_files, cache, week, weeknummer, jaar, rapport_schrijver, meting, taak):
+    # Dezelfde formulieren met dezelfde keuzes al eens verwerkt (ook door een andere
+    # coördinator): overzichten en exports direct uit de cache
+    taak.bijwerken("cache")
+    with meting.stap("cache"):
+        resultaat_sleutel = ("resultaat", CACHE_VERSIE, profiel.versie, week, weeknummer, jaar, rapport_schrijver,
+                             upload_hashes(uploaded_files))
+        opgeslagen = cache.get(resultaat_sleutel)
+    if opgeslagen is not None:
+        rond_meting_af(meting)
+        return dict(opgeslagen, meting=meting)
+
+    taak.bijwerken("extractie", klaar=0, totaal=aantal_formulieren(uploaded_files))
+
+    volgorde = []
+    gevonden = {}
+    nieuw = {}
+    overgeslagen = {}
+
+    def nieuwe_bronnen():
+        # Alleen uploads die nog niet in de cache staan gaan naar de extractie, en elke
+        # inhoud maar één keer (hetzelfde bestand twee keer geüpload)
+        for naam, data in geuploade_formulieren(uploaded_files, meting):
+            sleutel = (inhoud_hash(data), profiel.sleutel, CACHE_VERSIE)
+            volgorde.append((sleutel, naam))
+
+            resultaat = cache.get(sleutel)
+            if resultaat is not None:
+                gevonden[sleutel] = resultaat
+                taak.volgende()
+            elif sleutel not in nieuw:
+                nieuw[sleutel] = (naam, len(data))
+                yield data
+            else:
+                taak.volgende()
+
+    # Nog niet geziene uploads parallel verwerken; volgorde blijft die van de upload.
+    # Eén pass over word/document.xml: datumkiezer, kopvelden en categorieën
+    tijden = meting.extractie_tijden()
+    uitkomsten = []
+    with meting.stap("extractie"):
+        for uitkomst in extraheer_stroom(profiel, nieuwe_bronnen(), tijden=tijden, week=week):
+            uitkomsten.append(uitkomst)
+            taak.volgende()
+    meting.voeg_bestanden_toe([naam for naam, _ in nieuw.values()], tijden)
+
+    if nieuw:
+        taak.bijwerken("index")
+        with meting.stap("index"), ObservatieIndex() as index:
+            for (sleutel, (naam, grootte)), resultaat in zip(nieuw.items(), uitkomsten):
+                velden, treffers = resultaat
+                if treffers is None:
+                    # Buiten de week: niet volledig gelezen, dus niet bewaren
+                    overgeslagen[sleutel] = velden["datum"]
+                    continue
+
+                cache.put(sleutel, resultaat)
+                gevonden[sleutel] = resultaat
+
+                # Ook doorzoekbaar maken op de zoekpagina
+                index.toevoegen(naam, sleutel[0], grootte, velden, treffers, profiel.categorieen, profiel.kopvelden, onderdeel=profiel.naam)
+
+    # Ook eerder verwerkte uploads vallen soms buiten de week
+    # Een upload met dezelfde inhoud als een eerdere telt één keer, ook in "aantal"
+    per_bestand = []
+    namen = []
+    niet_in_week = []
+    gebruikt = set()
+    dubbele_bestanden = []
+    for sleutel, naam in volgorde:
+        if sleutel in gebruikt:
+            dubbele_bestanden.append(naam)
+            continue
+        gebruikt.add(sleutel)
+        if sleutel in overgeslagen:
+            niet_in_week.append((naam, overgeslagen[sleutel]))
+        elif week and buiten_week(gevonden[sleutel][0]["datum"], week):
+            niet_in_week.append((naam, gevonden[sleutel][0]["datum"]))
+        else:
+            per_bestand.append(gevonden[sleutel])
+            namen.append(naam)
+
+    taak.bijwerken("verzamelen")
+    with meting.stap("verzamelen"):
+        dubbele_observaties = []
+        resultaten = verzamel(profiel, per_bestand, namen, dubbele_observaties)
+
+    taak.bijwerken("rapport")
+    documenten = maak_documenten(profiel, resultaten, rapport_schrijver, meting, week=weeknummer, jaar=jaar, onderdeel=profiel.naam)
 
-    with zipfile.ZipFile(docx_path) as docx_zip:
-        with docx_zip.open('word/document.xml') as xml_file:
-            tree = etree.parse(xml_file)
-            root = tree.getroot()
+    taak.bijwerken("export")
+    exports = maak_exports(profiel, resultaten, meting, f"Week_{weeknummer}_Observaties_{profiel.naam}")
 
-            date_fields = []
-            for sdt in root.findall('.//w:sdt', namespaces):
-                # Kijk of dit een datumveld is
-                if sdt.find('.//w:date', namespaces) is not None:
-                    text_elements = sdt.findall('.//w:t', namespaces)
-                    value = ''.join(t.text for t in text_elements if t.text)
-                    date_fields.append(value)
+    resultaat = {"documenten": documenten, "exports": exports, "niet_in_week": niet_in_week, "aantal": len(gebruikt),
+                 "dubbele_bestanden": dubbele_bestanden, "dubbele_observaties": dubbele_observaties}
+    with meting.stap("cache"):
+        cache.put(resultaat_sleutel, resultaat)
 
-            return date_fields
+    rond_meting_af(meting)
+    return dict(resultaat, meting=meting)
 
 
 # -------------------------------
@@ -56,159 +150,49 @@ def extract_date_picker_fields(docx_path):
 # -------------------------------
 st.title("📄 Debriefings Verwerker")
 
-# Keuze voor onderdeel
+# Rapport via python-docx ("docx") of door het sjabloon in bulk te vullen ("sjabloon")
+rapport_schrijver = "sjabloon"
+
+# Keuze voor onderdeel; categorieën en kopvelden staan in het profiel (profielen.py)
 onderdeel = st.radio("Kies onderdeel:", ["VOV", "Nieuw-West"])
+profiel = compileer_profiel(onderdeel)
 
-# Categorieën per onderdeel
-categorieen_NW = ["OVERLAST PERSONEN", "JEUGDOVERLAST", "AFVALPROBLEMATIEK", "parkeeroverlast", "taken en opvallendheden"]
-categorieen_VOV = ["Jeugdoverlast", "Slapers/daklozen", "Geen/ongeldig vervoersbewijs", "Fietsen/steps/skaten/scooter", "Nooddeuren", "Roken", "Alcohol/drugs", "Diefstal", "Overig", "Werkopdracht 1", "Werkopdracht 2", "Werkopdracht 3", "Werkopdracht 4"]
-categorieen_SAIL = [
-    "Vrijhouden van calamiteitenroutes en vaarroutes",
-    "Toezien op in- en uitstroom van het evenement",
-    "Illegale evenementen in de openbare ruimte",
-    "In hoeverre vielen andere vormen van overlast op?",
-    "Sfeerbeeld op straat",
-    "Beschrijf hoe het publiek reageerde op de aanwezigheid van en contacten met THOR:",
-    "Was er sprake van agressie en geweld (fysiek en/of verbaal) tegen collega's van THOR?"
-]
-
-if onderdeel == "VOV":
-    categorieen = categorieen_VOV
-elif onderdeel == "Nieuw-West":
-    categorieen = categorieen_NW
-elif onderdeel == "SAIL":
-    categorieen = categorieen_SAIL
-else:
-    categorieen = []
-
-uploaded_files = st.file_uploader(
-    "Upload één of meerdere .docx-bestanden", 
-    type=["docx"], 
-    accept_multiple_files=True
-)
+meting = start_meting(onderdeel)
+
+# Standaard vorige week, als ISO-jaar en -week (in week 1 is dat week 52/53 van vorig jaar)
+jaar_vorige_week, vorige_week = (date.today() - timedelta(weeks=1)).isocalendar()[:2]
+
+jaar_keuze = st.number_input("Selecteer jaar", min_value=2000, max_value=2100, value=jaar_vorige_week)
+week_keuze = st.number_input("Selecteer weeknummer", min_value=1, max_value=53, value=vorige_week)
+
+weeknummer = int(week_keuze)
+jaar = int(jaar_keuze)
+
+# Formulieren met een datum buiten de gekozen week worden na de kop-tabel overgeslagen
+alleen_week = st.checkbox("Alleen formulieren uit de gekozen week", value=True)
+week = (jaar, weeknummer) if alleen_week else None
+
+uploaded_files = upload_formulieren()
 
 if uploaded_files:
-    resultaten = {cat: [] for cat in categorieen}
-
-    for uploaded_file in uploaded_files:
-        data = uploaded_file.read()
-        file_stream = BytesIO(data)
-        doc = Document(file_stream)
-
-        datum = None
-        dienst = None
-        inzetgebied = None
-
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".docx") as tmp_docx:
-            tmp_docx.write(data)
-            tmp_docx_path = tmp_docx.name
-
-        datumvelden = extract_date_picker_fields(tmp_docx_path)
-
-        # Kies eventueel de eerste datum die je vindt
-        if datumvelden:
-            datum = datumvelden[0]  # Of loop door om specifieke te vinden
-
-        # Zoek datum, dienst en inzetgebied
-        for table in doc.tables:
-            for row in table.rows:
-                for i, cell in enumerate(row.cells):
-                    if "Datum dienst" in cell.text and i + 1 < len(row.cells):
-                        datum = row.cells[i + 1].text.strip()
-                    if "datum dienst" in cell.text and i + 1 < len(row.cells):
-                        datum = row.cells[i + 1].text.strip()
-                    if "Soort dienst" in cell.text and i + 1 < len(row.cells):
-                        dienst = row.cells[i + 1].text.strip()
-                    if "Inzetgebied" in cell.text and i + 1 < len(row.cells):
-                        inzetgebied = row.cells[i + 1].text.strip()
-                    if "Inzetlocatie" in cell.text and i + 1 < len(row.cells):
-                        inzetgebied = row.cells[i + 1].text.strip()
-
-        # Zoek categorieën en teksten
-        for table in doc.tables:
-            rows = table.rows
-            for i, row in enumerate(rows):
-                rij_tekst = " ".join(cell.text.strip() for cell in row.cells)
-                for cat in categorieen:
-                    patroon = r"\b" + re.escape(cat) + r"\b"
-                    if re.search(patroon, rij_tekst, re.IGNORECASE):
-                        if i + 1 < len(rows):
-                            tekst_volgende_rij = rows[i + 1].cells[0].text.strip()
-                            if tekst_volgende_rij:
-                                if onderdeel == "SAIL":
-                                    resultaten[cat].append((datum, dienst, inzetgebied, tekst_volgende_rij))
-                                else:
-                                    resultaten[cat].append((datum, dienst, tekst_volgende_rij))
-
-    def sorteerdagdelen(item):
-        volgorde = {"ochtend": 0, "tussen": 1, "avond": 2}
-        try:
-            datum = datetime.strptime(item[0], "%d-%m-%Y")
-        except Exception:
-            datum = datetime.min
-
-        dienst = item[1].lower() if item[1] else ""
-        dienst_index = 99
-        for dagdeel in volgorde:
-            if dagdeel in dienst:
-                dienst_index = volgorde[dagdeel]
-                break
-        return (datum, dienst_index)
-
-    for cat in resultaten:
-        resultaten[cat].sort(key=sorteerdagdelen)
-
-    huidig_jaar = datetime.today().year
-    huidige_week = datetime.today().isocalendar()[1]
-
-    jaar_keuze = st.number_input("Selecteer jaar", min_value=2000, max_value=2100, value=huidig_jaar)
-    week_keuze = st.number_input("Selecteer weeknummer", min_value=1, max_value=53, value=huidige_week - 1)
-
-    weeknummer = int(week_keuze)
-    jaar = int(jaar_keuze)
-
-    doc_out = Document()
-    doc_out.add_heading(f'Debriefingsoverzicht Week {weeknummer} - {jaar}', 0)
-
-    for cat, items in resultaten.items():
-        if items:
-            doc_out.add_heading(cat.upper(), level=1)
-            for datum, dienst, tekst in items:
-                try:
-                    datum_obj = datetime.strptime(datum, "%d-%m-%Y")
-                    dag_van_week = datum_obj.strftime("%A")
-                    dag_nl = {
-                        "Monday": "Maandag",
-                        "Tuesday": "Dinsdag",
-                        "Wednesday": "Woensdag",
-                        "Thursday": "Donderdag",
-                        "Friday": "Vrijdag",
-                        "Saturday": "Zaterdag",
-                        "Sunday": "Zondag"
-                    }.get(dag_van_week, dag_van_week)
-                except Exception:
-                    dag_nl = ""
-
-                if onderdeel == "SAIL":
-                    doc_out.add_paragraph(f"{dag_nl} {datum} ({dienst}) - {inzetgebied}", style='Heading 3')
-                else:
-                    doc_out.add_paragraph(f"{dag_nl} {datum} ({dienst})", style='Heading 3')
-
-                for regel in tekst.split('\n'):
-                    regel = regel.strip()
-                    if regel:
-                        p = doc_out.add_paragraph(style='List Bullet')
-                        p.add_run(regel)
-
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".docx") as tmp_output:
-        doc_out.save(tmp_output.name)
-        tmp_output_path = tmp_output.name
-
-    with open(tmp_output_path, "rb") as file:
-        st.success("✅ Debriefing is gegenereerd!")
-        st.download_button(
-            label="📥 Download samenvatting",
-            data=file,
-            file_name=f"Week_{weeknummer}_Debriefingsoverzicht_{onderdeel}.docx",
-            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-        )
+    # Verwerken op de achtergrond met voortgang; bij dezelfde uploads en keuzes (ook na
+    # een klik op een download) komt het resultaat uit de sessie
+    sleutel = (upload_sleutel(uploaded_files), profiel.sleutel, week, weeknummer, jaar, rapport_schrijver)
+    taak = huidige_taak("app", sleutel) or start_taak(
+        "app", sleutel,
+        partial(verwerk, profiel, uploaded_files, gedeelde_cache(), week, weeknummer, jaar, rapport_schrijver, meting)
+    )
+
+    if toon_voortgang("app", taak):
+        resultaat = taak.resultaat
+        niet_in_week = resultaat["niet_in_week"]
+        if niet_in_week:
+            st.info(f"{len(niet_in_week)} van de {resultaat['aantal']} formulieren overgeslagen: datum buiten week {weeknummer} van {jaar}")
+            with st.expander("Overgeslagen formulieren"):
+                for naam, datum in niet_in_week:
+                    st.markdown(f"- {naam} ({datum})")
+
+        toon_dubbelen(resultaat["dubbele_bestanden"], resultaat["dubbele_observaties"])
+        toon_downloads(resultaat["documenten"])
+        toon_exports(resultaat["exports"])
+        toon_meting(resultaat["meting"])
@@ -0,0 +1,100 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tracemalloc
+import zipfile
+from datetime import datetime
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_verwerking import STANDAARD_UITVOER, git_commit
+from docx_extractie import zip_formulieren
+from formulieren import maak_formulier
+from overzicht import extraheer_stroom, verzamel
+from profielen import compileer_profiel
+
+# -------------------------------
+# Piekgeheugen van de verwerking, over het aantal formulieren in één upload
+# -------------------------------
+# Zoals een eventpagina een .zip van een weekmap verwerkt: formulieren één voor één uit
+# de zip, door de extractie, en per formulier alleen (velden, treffers) bewaard. Gemeten
+# met tracemalloc, bovenop de upload zelf (die houdt Streamlit toch al vast):
+# - bewaard: wat er na afloop nog staat (de observaties, groeit met het aantal)
+# - werkgeheugen: piek min bewaard; hoort gelijk te blijven, hoe groot de upload ook is
+# Met --workers > 1 gebeurt het parsen in andere processen en meet dit alleen het
+# hoofdproces (de Streamlit-worker).
+
+
+def maak_zip(categorieen, aantal, rijen, regels, seed=1):
+    rnd = random.Random(seed)
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as archief:
+        for i in range(aantal):
+            archief.writestr(f"Week22/formulier_{i:04d}.docx", maak_formulier(categorieen, rnd, rijen, regels))
+    buffer.name = "Week22.zip"
+    return buffer
+
+
+def meet(profiel, upload, workers):
+    # (werkgeheugen, bewaard) in bytes
+    upload.seek(0)
+    tracemalloc.start()
+    basis = tracemalloc.get_traced_memory()[0]
+
+    per_bestand = list(extraheer_stroom(profiel, (data for _, data in zip_formulieren(upload)), workers))
+    resultaten = verzamel(profiel, per_bestand)
+
+    huidig, piek = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del per_bestand, resultaten
+    return piek - huidig, huidig - basis
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Meet het piekgeheugen van de verwerking over het aantal formulieren")
+    parser.add_argument("--profiel", default="SAIL")
+    parser.add_argument("--bestanden", type=int, nargs="+", default=[25, 100, 400])
+    parser.add_argument("--rijen", type=int, default=20, help="extra vulrijen per tabel")
+    parser.add_argument("--regels", type=int, default=5, help="alinea's per antwoord")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--marge", type=float, default=1.5,
+                        help="toegestane groei van het werkgeheugen van de kleinste naar de grootste upload")
+    parser.add_argument("--uitvoer", default=STANDAARD_UITVOER)
+    args = parser.parse_args()
+
+    profiel = compileer_profiel(args.profiel)
+    basis = {
+        "tijdstip": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "workers": args.workers,
+        "soort": "geheugen",
+        "profiel": profiel.naam,
+    }
+
+    print(f"{'bestanden':>9} {'upload MB':>10} {'werkgeheugen MB':>16} {'bewaard MB':>11}")
+    werkgeheugen = []
+    with open(args.uitvoer, "a", encoding="utf-8") as uitvoer:
+        for aantal in sorted(args.bestanden):
+            upload = maak_zip(profiel.categorieen, aantal, args.rijen, args.regels)
+            werk, bewaard = meet(profiel, upload, args.workers)
+            werkgeheugen.append(werk)
+
+            grootte = upload.getbuffer().nbytes
+            uitvoer.write(json.dumps(dict(basis, bestanden=aantal, upload_kb=round(grootte / 1024, 1),
+                                          werkgeheugen_kb=round(werk / 1024, 1), bewaard_kb=round(bewaard / 1024, 1)),
+                                     ensure_ascii=False) + "\n")
+            print(f"{aantal:>9} {grootte / 2**20:>10.1f} {werk / 2**20:>16.2f} {bewaard / 2**20:>11.2f}")
+
+    if werkgeheugen[-1] > args.marge * werkgeheugen[0]:
+        print(f"❌ Werkgeheugen groeit met de upload: {werkgeheugen[0] / 2**20:.2f} -> {werkgeheugen[-1] / 2**20:.2f} MB")
+        sys.exit(1)
+    print("✅ Werkgeheugen blijft gelijk over het aantal formulieren")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rapport import SCHRIJVERS
+
+# -------------------------------
+# python-docx tegenover sjabloon: zelfde overzicht, andere schrijver
+# -------------------------------
+CATEGORIEEN = [
+    "Vrijhouden van calamiteitenroutes en vaarroutes",
+    "Toezien op in- en uitstroom van het evenement",
+    "Illegale evenementen in de openbare ruimte",
+    "Sfeerbeeld op straat",
+]
+DIENSTEN = ["Ochtenddienst", "Tussendienst", "Avonddienst"]
+GEBIEDEN = ["Centrum", "Oost", "West", "S105", "IJ-oevers"]
+
+
+def maak_observaties(aantal, regels, seed=1):
+    rnd = random.Random(seed)
+    return [
+        (
+            f"{rnd.randint(1, 28):02d}-08-2025",
+            rnd.choice(DIENSTEN),
+            rnd.choice(GEBIEDEN),
+            rnd.choice(CATEGORIEEN),
+            "\n".join(f"Observatie {i}, regel {r}: veel publiek bij de kade & brug" for r in range(regels)),
+        )
+        for i in range(aantal)
+    ]
+
+
+def schrijf(schrijver, observaties):
+    # Opbouw zoals de eventpagina's: rode categorie-kop, inzetgebied, dienst en bullets
+    rapport = SCHRIJVERS[schrijver]()
+    rapport.titel("Debriefingsoverzicht SAIL 2025")
+    for cat in CATEGORIEEN:
+        rapport.kop(cat.upper(), 1, rood=True)
+        for datum, dienst, inzetgebied, categorie, tekst in observaties:
+            if categorie != cat:
+                continue
+            rapport.kop(f"📍 {inzetgebied} ({datum})", 2)
+            rapport.alinea(dienst, vet=True, ruimte_na=0)
+            for regel in tekst.split("\n"):
+                rapport.opsomming(regel)
+    return rapport.naar_bytes()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vergelijk de python-docx- en sjabloonschrijver")
+    parser.add_argument("--aantallen", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--regels", type=int, default=4, help="bullets per observatie")
+    parser.add_argument("--herhalingen", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'observaties':>12} {'schrijver':>10} {'beste (s)':>10} {'grootte (kB)':>13}")
+    for aantal in args.aantallen:
+        observaties = maak_observaties(aantal, args.regels)
+        for schrijver in SCHRIJVERS:
+            tijden = []
+            for _ in range(args.herhalingen):
+                start = time.perf_counter()
+                data = schrijf(schrijver, observaties)
+                tijden.append(time.perf_counter() - start)
+            print(f"{aantal:>12} {schrijver:>10} {min(tijden):>10.3f} {len(data) / 1024:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
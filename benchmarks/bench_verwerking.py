@@ -0,0 +1,108 @@
+import argparse
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docx_extractie import aantal_workers
+from formulieren import maak_formulieren
+from overzicht import extraheer, verzamel, maak_overzichten
+from profielen import compileer_profiel
+
+# -------------------------------
+# Extractie en rapport per script, over bestandsaantal, tabelgrootte en tekstlengte
+# -------------------------------
+# Elke meting is één JSON-regel in --uitvoer, zodat runs over tijd te vergelijken zijn
+SCRIPTS = {
+    "debriefings.py": "Nieuw-West",
+    "app.py": "VOV",
+    "debriefings_SAIL.py": "SAIL",
+    "debriefings_Pride.py": "Pride",
+    "debriefings_FestivalOpRing.py": "FestivalOpRing",
+}
+
+STANDAARD_UITVOER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resultaten.jsonl")
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def meet(profiel, bronnen, workers, schrijver):
+    # Geeft de tijden per stap en het aantal observaties van één run
+    tijden = {}
+
+    start = time.perf_counter()
+    per_bestand = extraheer(profiel, bronnen, workers)
+    tijden["extractie"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    resultaten = verzamel(profiel, per_bestand)
+    tijden["verzamelen"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    maak_overzichten(profiel, profiel.weergaven, resultaten, schrijver, week=22, jaar=2025, onderdeel=profiel.naam)
+    tijden["rapport"] = time.perf_counter() - start
+
+    return tijden, sum(len(items) for items in resultaten.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Meet extractie en rapport op synthetische formulieren")
+    parser.add_argument("--scripts", nargs="+", default=list(SCRIPTS), choices=list(SCRIPTS))
+    parser.add_argument("--bestanden", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--rijen", type=int, nargs="+", default=[0, 20], help="extra vulrijen per tabel")
+    parser.add_argument("--regels", type=int, nargs="+", default=[2, 10], help="alinea's per antwoord")
+    parser.add_argument("--herhalingen", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=None, help="standaard DEBRIEFINGS_WORKERS of het aantal cores")
+    parser.add_argument("--schrijver", default="sjabloon", choices=["docx", "sjabloon"])
+    parser.add_argument("--uitvoer", default=STANDAARD_UITVOER)
+    args = parser.parse_args()
+
+    workers = args.workers or aantal_workers()
+    basis = {
+        "tijdstip": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "cpu": os.cpu_count(),
+        "workers": workers,
+        "schrijver": args.schrijver,
+    }
+
+    print(f"{'script':>30} {'bestanden':>9} {'rijen':>6} {'regels':>6} {'extractie':>10} {'verzamelen':>10} {'rapport':>8} {'obs.':>6}")
+    with open(args.uitvoer, "a", encoding="utf-8") as uitvoer:
+        for script in args.scripts:
+            profiel = compileer_profiel(SCRIPTS[script])
+            for aantal, rijen, regels in itertools.product(args.bestanden, args.rijen, args.regels):
+                bronnen = maak_formulieren(profiel.categorieen, aantal, rijen, regels)
+
+                runs = [meet(profiel, bronnen, workers, args.schrijver) for _ in range(args.herhalingen)]
+                beste = {stap: min(tijden[stap] for tijden, _ in runs) for stap in runs[0][0]}
+                observaties = runs[0][1]
+
+                regel = dict(basis, script=script, profiel=profiel.naam, bestanden=aantal, rijen=rijen, regels=regels,
+                             invoer_kb=round(sum(map(len, bronnen)) / 1024, 1), observaties=observaties,
+                             **{f"{stap}_s": round(tijd, 4) for stap, tijd in beste.items()})
+                uitvoer.write(json.dumps(regel, ensure_ascii=False) + "\n")
+                uitvoer.flush()
+
+                print(f"{script:>30} {aantal:>9} {rijen:>6} {regels:>6} {beste['extractie']:>10.3f} "
+                      f"{beste['verzamelen']:>10.4f} {beste['rapport']:>8.3f} {observaties:>6}")
+
+    print(f"Resultaten toegevoegd aan {args.uitvoer}")
+
+
+if __name__ == "__main__":
+    main()
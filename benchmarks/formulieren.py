@@ -0,0 +1,159 @@
+import argparse
+import os
+import random
+import sys
+import zipfile
+from datetime import date, timedelta
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from profielen import compileer_profiel
+from rapport import STANDAARD_SJABLOON, _lees_sjabloon
+
+# -------------------------------
+# Synthetische debriefingsformulieren, opgebouwd zoals die in Week22
+# -------------------------------
+# - kop-tabel (naam, onderdeel, datum dienst, soort dienst, inzetgebied)
+# - soms geen "Datum dienst" maar een datumkiezer (w:sdt met w:date)
+# - categorie-tabel: vraag over twee kolommen (gridSpan), antwoord met meerdere
+#   alinea's en regeleinden, tussendoor rijen met een verticaal samengevoegde cel
+# - tekst in losse runs geknipt, zoals Word dat doet
+DIENSTEN = ["Ochtenddienst 07:00-15:30u", "Tussendienst 10:00-19:30u", "Avonddienst 15:00-23:30u", "Nachtdienst"]
+GEBIEDEN = ["Centrum", "Oost", "West", "S105 Noord", "Slotermeer", "Osdorp", "Geuzenveld"]
+ZINNEN = [
+    "Groep jongeren bij het winkelcentrum aangesproken",
+    "Afval naast de containers aan de Burgemeester Roëllstraat",
+    "Rustige dienst, geen bijzonderheden",
+    "Melding over geluidsoverlast doorgezet naar de politie",
+    "Fout geparkeerde auto's op de stoep & in de bocht",
+    "Publiek reageerde positief op de aanwezigheid van THOR",
+    "Hangplek bij het Sierplein gecontroleerd",
+]
+
+
+def _runs(rnd, tekst):
+    # Knip de tekst in stukken van 1-8 tekens, elk in een eigen run
+    delen = []
+    i = 0
+    while i < len(tekst):
+        j = min(len(tekst), i + rnd.randint(1, 8))
+        stuk = tekst[i:j]
+        ruimte = ' xml:space="preserve"' if stuk != stuk.strip() else ""
+        delen.append(f"<w:r><w:t{ruimte}>{escape(stuk)}</w:t></w:r>")
+        i = j
+    return "".join(delen)
+
+
+def _alinea(rnd, tekst):
+    return f"<w:p>{_runs(rnd, tekst)}</w:p>"
+
+
+def _cel(inhoud, span=1, v_merge=None):
+    eigenschappen = ""
+    if span > 1:
+        eigenschappen += f'<w:gridSpan w:val="{span}"/>'
+    if v_merge == "restart":
+        eigenschappen += '<w:vMerge w:val="restart"/>'
+    elif v_merge == "continue":
+        eigenschappen += "<w:vMerge/>"
+    return f"<w:tc><w:tcPr>{eigenschappen}</w:tcPr>{inhoud or '<w:p/>'}</w:tc>"
+
+
+def _tabel(rijen, kolommen=2):
+    grid = "".join('<w:gridCol w:w="4300"/>' for _ in range(kolommen))
+    return f"<w:tbl><w:tblPr/><w:tblGrid>{grid}</w:tblGrid>{''.join(rijen)}</w:tbl>"
+
+
+def _antwoord(rnd, regels):
+    # Meerdere alinea's, soms met een zachte regeleinde (w:br) erin
+    alineas = []
+    for _ in range(regels):
+        zin = rnd.choice(ZINNEN)
+        if rnd.random() < 0.3:
+            alineas.append(f"<w:p>{_runs(rnd, zin)}<w:r><w:br/></w:r>{_runs(rnd, rnd.choice(ZINNEN))}</w:p>")
+        else:
+            alineas.append(_alinea(rnd, zin))
+    return "".join(alineas)
+
+
+def _datumkiezer(rnd, datum):
+    tekst = datum.strftime("%d-%m-%Y")
+    return (
+        '<w:sdt><w:sdtPr><w:date w:fullDate="%sT00:00:00Z"><w:dateFormat w:val="dd-MM-yyyy"/></w:date></w:sdtPr>'
+        "<w:sdtContent>%s</w:sdtContent></w:sdt>" % (datum.isoformat(), _alinea(rnd, tekst))
+    )
+
+
+def maak_formulier(categorieen, rnd, rijen=0, regels=3, datum=None):
+    # Geeft de bytes van één .docx
+    # rijen: extra vulrijen per tabel (tabelgrootte), regels: alinea's per antwoord
+    datum = datum or date(2025, 5, 26) + timedelta(days=rnd.randint(0, 6))
+    met_datumkiezer = rnd.random() < 0.25
+
+    body = [_alinea(rnd, "Debriefingsformulier THOR"), "<w:p/>"]
+
+    kop = [
+        ("Naam + functie", "E. Voorbeeld, Toezichthouder Algemeen."),
+        ("Organisatieonderdeel THOR", "Thor Nieuw-West"),
+        ("Soort dienst (ochtend/avond/nacht) + tijden", rnd.choice(DIENSTEN)),
+        ("Inzetgebied", rnd.choice(GEBIEDEN)),
+    ]
+    if not met_datumkiezer:
+        kop.insert(2, ("Datum dienst", datum.strftime("%d-%m-%Y")))
+    kop.extend((f"Toelichting {i}", rnd.choice(ZINNEN)) for i in range(rijen))
+    body.append(_tabel([
+        f"<w:tr>{_cel(_alinea(rnd, label))}{_cel(_alinea(rnd, waarde))}</w:tr>" for label, waarde in kop
+    ]))
+
+    if met_datumkiezer:
+        body.append(_alinea(rnd, "Datum:"))
+        body.append(_datumkiezer(rnd, datum))
+
+    tabelrijen = []
+    for i, cat in enumerate(categorieen):
+        tabelrijen.append(f"<w:tr>{_cel(_alinea(rnd, cat), span=2)}</w:tr>")
+        antwoord = _antwoord(rnd, regels) if rnd.random() < 0.8 else ""
+        tabelrijen.append(f"<w:tr>{_cel(antwoord, span=2)}</w:tr>")
+        if rijen and i % 2 == 0:
+            # Locatie links, over meerdere rijen samengevoegd
+            tabelrijen.append(f"<w:tr>{_cel(_alinea(rnd, 'Locatie'), v_merge='restart')}{_cel(_alinea(rnd, rnd.choice(GEBIEDEN)))}</w:tr>")
+            for _ in range(rijen):
+                tabelrijen.append(f"<w:tr>{_cel('', v_merge='continue')}{_cel(_alinea(rnd, rnd.choice(ZINNEN)))}</w:tr>")
+    body.append(_tabel(tabelrijen))
+
+    onderdelen, _, voor, na = _lees_sjabloon(STANDAARD_SJABLOON)
+    document_xml = (voor + "".join(body) + na).encode("utf-8")
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as z:
+        for info, inhoud in onderdelen:
+            z.writestr(info.filename, document_xml if info.filename == "word/document.xml" else inhoud)
+    return buffer.getvalue()
+
+
+def maak_formulieren(categorieen, aantal, rijen=0, regels=3, seed=1):
+    rnd = random.Random(seed)
+    return [maak_formulier(categorieen, rnd, rijen, regels) for _ in range(aantal)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Schrijf synthetische debriefingsformulieren naar een map")
+    parser.add_argument("map")
+    parser.add_argument("--profiel", default="Nieuw-West")
+    parser.add_argument("--aantal", type=int, default=20)
+    parser.add_argument("--rijen", type=int, default=0, help="extra vulrijen per tabel")
+    parser.add_argument("--regels", type=int, default=3, help="alinea's per antwoord")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    os.makedirs(args.map, exist_ok=True)
+    categorieen = compileer_profiel(args.profiel).categorieen
+    for i, data in enumerate(maak_formulieren(categorieen, args.aantal, args.rijen, args.regels, args.seed)):
+        with open(os.path.join(args.map, f"Debriefingsformulier {i:04d}.docx"), "wb") as f:
+            f.write(data)
+    print(f"{args.aantal} formulieren geschreven naar {args.map}")
+
+
+if __name__ == "__main__":
+    main()
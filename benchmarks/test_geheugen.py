@@ -0,0 +1,20 @@
+from bench_geheugen import maak_zip, meet
+from profielen import compileer_profiel
+
+# -------------------------------
+# Vaste controle op bench_geheugen.py (python -m pytest): het werkgeheugen van de
+# verwerking groeit niet mee met het aantal formulieren in een upload
+# -------------------------------
+MARGE = 1.5
+
+
+def test_werkgeheugen_groeit_niet_mee():
+    profiel = compileer_profiel("SAIL")
+    werkgeheugen = []
+    for aantal in (25, 200):
+        werk, _ = meet(profiel, maak_zip(profiel.categorieen, aantal, rijen=20, regels=5), workers=1)
+        werkgeheugen.append(werk)
+
+    assert werkgeheugen[1] <= MARGE * werkgeheugen[0], (
+        f"werkgeheugen {werkgeheugen[0] / 2**20:.2f} -> {werkgeheugen[1] / 2**20:.2f} MB van 25 naar 200 formulieren"
+    )
@@ -0,0 +1,51 @@
+import re
+from functools import lru_cache
+
+# -------------------------------
+# Alle categorieën in één scan per rij
+# -------------------------------
+class CategorieMatcher:
+
+    def __init__(self, categorieen):
+        self.categorieen = list(categorieen)
+
+        # Zelfde patroon per categorie als voorheen (\b...\b, hoofdletterongevoelig),
+        # samengevoegd tot één alternatie. Langste eerst, zodat bij dezelfde startpositie
+        # de langere categorie wint; de lookahead laat elke positie meetellen.
+        volgorde = sorted(range(len(self.categorieen)), key=lambda i: -len(self.categorieen[i]))
+        self._groep_naar_index = {groep: index for groep, index in enumerate(volgorde, start=1)}
+        alternatieven = "|".join(
+            r"\b(" + re.escape(self.categorieen[i]) + r")\b" for i in volgorde
+        )
+        self._patroon = re.compile(r"(?=" + alternatieven + r")", re.IGNORECASE)
+
+        # Een categorie die binnen een andere categorie valt kan door die langere
+        # treffer verdrongen worden; alleen dan los controleren
+        self._binnen = {}
+        for i, cat in enumerate(self.categorieen):
+            omvattend = [
+                j for j, ander in enumerate(self.categorieen)
+                if j != i and len(ander) > len(cat) and cat.lower() in ander.lower()
+            ]
+            if omvattend:
+                self._binnen[i] = (omvattend, re.compile(r"\b" + re.escape(cat) + r"\b", re.IGNORECASE))
+
+    def zoek(self, rij_tekst):
+        # Geeft alle gevonden categorieën terug, in de volgorde van de categorielijst
+        gevonden = {self._groep_naar_index[m.lastindex] for m in self._patroon.finditer(rij_tekst)}
+
+        for i, (omvattend, patroon) in self._binnen.items():
+            if i not in gevonden and any(j in gevonden for j in omvattend) and patroon.search(rij_tekst):
+                gevonden.add(i)
+
+        return [self.categorieen[i] for i in sorted(gevonden)]
+
+
+@lru_cache(maxsize=None)
+def _compileer(categorieen):
+    return CategorieMatcher(categorieen)
+
+
+def compileer_matcher(categorieen):
+    # Eén keer per categorielijst compileren
+    return _compileer(tuple(categorieen))
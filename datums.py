@@ -0,0 +1,55 @@
+import re
+from datetime import date
+
+# -------------------------------
+# Datums en diensten zoals ze in de formulieren staan
+# -------------------------------
+MAANDEN = {
+    "januari": 1, "februari": 2, "maart": 3, "april": 4,
+    "mei": 5, "juni": 6, "juli": 7, "augustus": 8,
+    "september": 9, "oktober": 10, "november": 11, "december": 12
+}
+
+# 31-05-2025, 31-5-2025, 31/5/2025, 31.05.2025
+_NUMERIEK = re.compile(r"(\d{1,2})\s*[-/.]\s*(\d{1,2})\s*[-/.]\s*(\d{4})")
+# (Zaterdag) 31 mei 2025
+_MET_MAAND = re.compile(r"(\d{1,2})\s+([a-z]+)\s+(\d{4})")
+
+
+def parse_datum(datum_str):
+    # Geeft een date terug, of None als de tekst geen herkenbare datum is
+    if not datum_str:
+        return None
+
+    tekst = datum_str.strip().lower()
+    m = _NUMERIEK.search(tekst)
+    if m:
+        dag, maand, jaar = int(m.group(1)), int(m.group(2)), int(m.group(3))
+    else:
+        m = _MET_MAAND.search(tekst)
+        if not m or m.group(2) not in MAANDEN:
+            return None
+        dag, maand, jaar = int(m.group(1)), MAANDEN[m.group(2)], int(m.group(3))
+
+    try:
+        return date(jaar, maand, dag)
+    except ValueError:
+        return None
+
+
+DAGDELEN = {"ochtend": 0, "tussen": 1, "avond": 2}
+
+
+def dienst_index(dienst):
+    # Binnen een dag: ochtend - tussen - avond; onbekend achteraan
+    dienst = dienst.lower() if dienst else ""
+    for dagdeel, index in DAGDELEN.items():
+        if dagdeel in dienst:
+            return index
+    return 99
+
+
+def dagdeel(dienst):
+    # "Ochtenddienst 07:00-15:30u" -> "ochtend"; None als het geen bekend dagdeel is
+    dienst = dienst.lower() if dienst else ""
+    return next((dagdeel for dagdeel in DAGDELEN if dagdeel in dienst), None)
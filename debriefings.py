@@ -1,107 +1,275 @@
-from docx import Document
-import re
+from observatie_index import ObservatieIndex
+from overzicht import verzamel, maak_overzicht, vul_overzicht_aan
+from profielen import PROFIELEN, compileer_profiel
+from docx_extractie import gedeelde_pool, is_formulier, is_overzicht
+from export import FORMATEN, beschikbare_formaten, export_rijen, exporteer
+import argparse
 import os
-from datetime import datetime, timedelta, date
-from pathlib import Path
+import re
+import sys
+import time
+from contextlib import nullcontext
+from datetime import datetime, timedelta
 
 vandaag = datetime.today()
 vorige_week = vandaag - timedelta(weeks=1)
 weeknummer = vorige_week.isocalendar()[1]
 weekmap = f"Debriefingsformulieren/Week{weeknummer}"
 
-onderdeel = "NW"
-
-categorieen_NW = ["OVERLAST PERSONEN", "JEUGDOVERLAST", "AFVALPROBLEMATIEK", "parkeeroverlast", "taken en opvallendheden"]
-categorieen_VOV = ["Jeugdoverlast", "Slapers/daklozen", "Geen/ongeldig vervoersbewijs", "Fietsen/steps/skaten/scooter", "Nooddeuren", "Roken", "Alcohol/drugs", "Diefstal", "Overig"]
-
-categorieen = categorieen_NW if onderdeel == "NW" else categorieen_VOV
-resultaten = {cat: [] for cat in categorieen}
-
-
-# Zoek de datum één keer, los van categorieën
-for bestandsnaam in os.listdir(weekmap):
-    if bestandsnaam.endswith(".docx"):
-        pad = os.path.join(weekmap, bestandsnaam)
-        doc = Document(pad)
-
-        datum = None
-        dienst = None
-
-        for table in doc.tables:
-            for row in table.rows:
-                for i, cell in enumerate(row.cells):
-                    if "Datum dienst" in cell.text:
-                        if i + 1 < len(row.cells):
-                            datum = row.cells[i + 1].text.strip()
-                        break
-                    if "Soort dienst" in cell.text:
-                        if i + 1 < len(row.cells):
-                            dienst = row.cells[i + 1].text.strip()
-                        break
-
-        for table in doc.tables:
-            rows = table.rows
-            for i, row in enumerate(rows):
-                rij_tekst = " ".join(cell.text.strip() for cell in row.cells)
-                for cat in categorieen:
-                    patroon = r"\b" + re.escape(cat) + r"\b"
-                    if re.search(patroon, rij_tekst, re.IGNORECASE):
-                        if i + 1 < len(rows):
-                            tekst_volgende_rij = rows[i + 1].cells[0].text.strip()
-                            if tekst_volgende_rij:  # alleen als er echt tekst is
-                                resultaten[cat].append((datum, dienst, tekst_volgende_rij))
-
-doc_out = Document()
-doc_out.add_heading(f'Debriefingoverzicht Week {weeknummer}', 0)
-
-def sorteersleutel(item):
-    volgorde = {"ochtend": 0, "tussen": 1, "avond": 2}
-    try:
-        datum = datetime.strptime(item[0], "%d-%m-%Y")
-    except Exception:
-        datum = datetime.min
-
-    dienst = item[1].lower()
-    dienst_index = 99  # fallback als dienst onbekend is
-    for dagdeel in volgorde:
-        if dagdeel in dienst:
-            dienst_index = volgorde[dagdeel]
-            break
-
-    return (datum, dienst_index)
-
-for cat in resultaten:
-    def parse_datum(item):
+onderdeel = "Nieuw-West"
+
+# Categorieën en kopvelden van het onderdeel (profielen.py)
+profiel = compileer_profiel(onderdeel)
+
+# Rapport via python-docx ("docx") of door het sjabloon in bulk te vullen ("sjabloon")
+rapport_schrijver = "sjabloon"
+
+FORMULIERENMAP = "Debriefingsformulieren"
+
+# Weergave van de weekoverzichten (overzicht.py)
+WEERGAVE = "per_categorie"
+
+
+def overzicht_naam(weeknummer, onderdeel):
+    # Het standaardonderdeel houdt de oude bestandsnaam
+    if onderdeel == profiel.naam:
+        return f"Week {weeknummer} Debriefingsoverzicht.docx"
+    return f"Week {weeknummer} Debriefingsoverzicht {onderdeel}.docx"
+
+
+def export_naam(weeknummer, onderdeel, formaat):
+    return f"Week {weeknummer} Observaties {onderdeel}.{FORMATEN[formaat][0]}"
+
+
+def verwerk_week(weekmap, weeknummer, onderdeel=onderdeel, jaar=None, workers=None, exports=(), pool=None, index=None):
+    # pool en index: gedeeld over meerdere weken (inhalen); zonder maakt elke week ze zelf
+    profiel = compileer_profiel(onderdeel)
+    paden = [
+        os.path.join(weekmap, bestandsnaam)
+        for bestandsnaam in os.listdir(weekmap)
+        if is_formulier(bestandsnaam) and not is_overzicht(bestandsnaam)
+    ]
+    namen = [os.path.basename(pad) for pad in paden]
+
+    titel = f'Debriefingoverzicht Week {weeknummer}'
+    if jaar:
+        titel += f' - {jaar}'
+    output_pad = os.path.join(weekmap, overzicht_naam(weeknummer, onderdeel))
+
+    with nullcontext(index) if index is not None else ObservatieIndex() as index:
+        # Alleen nieuwe of gewijzigde formulieren worden (parallel) verwerkt; de rest
+        # komt uit de lokale index. Volgorde blijft die van de map.
+        per_bestand = index.bijwerken(paden, profiel.categorieen, profiel.kopvelden, onderdeel=profiel.naam, workers=workers,
+                                      mappen=[weekmap], pool=pool)
+        hashes = index.hashes(paden, profiel.categorieen, profiel.kopvelden)
+
+        # Staat alles uit het vorige overzicht er nog, dan komen alleen de nieuwe
+        # formulieren erbij (aanvullen); anders wordt het overzicht opnieuw gemaakt
+        vorige = None
+        if rapport_schrijver == "sjabloon":
+            vorige = index.overzicht_inhoud(output_pad, profiel.sleutel, WEERGAVE, titel)
+        if vorige is not None and not vorige <= set(hashes):
+            vorige = None
+
+        # Eerst wat al in het overzicht staat, zodat het ontdubbelen dezelfde
+        # observaties houdt als de vorige keer
+        volgorde = list(range(len(paden)))
+        if vorige is not None:
+            volgorde.sort(key=lambda i: hashes[i] not in vorige)
+
+        # Dezelfde inhoud onder twee namen wordt door de index één keer gelezen; dubbele
+        # observaties (ook uit verschillende formulieren) komen één keer in het overzicht
+        dubbelen = []
+        resultaten = verzamel(profiel, [per_bestand[i] for i in volgorde], [namen[i] for i in volgorde], dubbelen)
+        if dubbelen:
+            print(f"ℹ️ Week {weeknummer}, {profiel.naam}: {len(dubbelen)} dubbele observaties weggelaten")
+
+        rapport = None
+        if vorige is None:
+            rapport = maak_overzicht(profiel, WEERGAVE, resultaten, titel, rapport_schrijver, dagnaam=False)
+        else:
+            nieuw = {namen[i] for i in volgorde if hashes[i] not in vorige}
+            if nieuw:
+                with open(output_pad, "rb") as f:
+                    bestaand = f.read()
+                nieuwe_resultaten = {cat: [obs for obs in items if obs.bestand in nieuw] for cat, items in resultaten.items()}
+                try:
+                    rapport = vul_overzicht_aan(profiel, WEERGAVE, bestaand, nieuwe_resultaten, dagnaam=False)
+                    print(f"ℹ️ Week {weeknummer}, {profiel.naam}: {len(nieuw)} nieuwe formulieren aan het overzicht toegevoegd")
+                except ValueError:
+                    rapport = maak_overzicht(profiel, WEERGAVE, resultaten, titel, rapport_schrijver, dagnaam=False)
+
+        # Zonder nieuwe formulieren blijft het overzicht zoals het is
+        if rapport is not None:
+            with open(output_pad, "wb") as f:
+                f.write(rapport.naar_bytes())
+            index.overzicht_opslaan(output_pad, profiel.sleutel, WEERGAVE, titel, hashes)
+
+    # Dezelfde observaties als tabel (--export), naast het overzicht
+    rijen = export_rijen(profiel, resultaten) if exports else []
+    for formaat in exports:
+        with open(os.path.join(weekmap, export_naam(weeknummer, profiel.naam, formaat)), "wb") as f:
+            f.write(exporteer(rijen, formaat))
+    return output_pad
+
+
+# -------------------------------
+# Meerdere weken in één keer (inhalen)
+# -------------------------------
+def parse_bereik(tekst):
+    # "18-22,30" -> {18, 19, 20, 21, 22, 30}
+    getallen = set()
+    for deel in tekst.replace(" ", "").split(","):
+        if not deel:
+            continue
+        begin, _, eind = deel.partition("-")
+        getallen.update(range(int(begin), int(eind or begin) + 1))
+    return getallen
+
+
+def weekmappen(weken=None, jaren=None):
+    # [(jaar, week, pad)]: Debriefingsformulieren/WeekNN, of met jaren
+    # Debriefingsformulieren/JJJJ/WeekNN (archief van eerdere seizoenen)
+    basismappen = [(None, FORMULIERENMAP)]
+    if jaren:
+        basismappen = [(jaar, os.path.join(FORMULIERENMAP, str(jaar))) for jaar in sorted(jaren)]
+
+    gevonden = []
+    for jaar, basis in basismappen:
+        if not os.path.isdir(basis):
+            continue
+        for naam in os.listdir(basis):
+            m = re.fullmatch(r"Week(\d{1,2})", naam)
+            pad = os.path.join(basis, naam)
+            if m and os.path.isdir(pad) and (not weken or int(m.group(1)) in weken):
+                gevonden.append((jaar, int(m.group(1)), pad))
+    return sorted(gevonden, key=lambda item: (item[0] or 0, item[1]))
+
+
+def inhalen(weken=None, jaren=None, onderdelen=(onderdeel,), workers=None, exports=()):
+    # Eén overzicht per week en onderdeel, week na week. Alleen de extractie is parallel,
+    # over één process pool en met één verbinding met de index voor alle weken
+    taken = [(jaar, week, pad, o) for jaar, week, pad in weekmappen(weken, jaren) for o in onderdelen]
+    if not taken:
+        print("Geen weekmappen gevonden")
+        return True
+
+    gelukt = True
+    with gedeelde_pool(workers) as pool, ObservatieIndex() as index:
+        for jaar, week, pad, o in taken:
+            try:
+                output_pad = verwerk_week(pad, week, o, jaar=jaar, workers=workers, exports=exports, pool=pool, index=index)
+                print(f"✅ Document opgeslagen als: {output_pad}")
+            except Exception as e:
+                gelukt = False
+                print(f"❌ Week {week}{f' ({jaar})' if jaar else ''}, {o}: {e}", file=sys.stderr)
+    return gelukt
+
+
+# -------------------------------
+# Weekmappen bewaken (--bewaken)
+# -------------------------------
+def map_stand(weekmap):
+    # {naam: (mtime_ns, grootte)} van de formulieren; één scandir, er wordt niets geopend
+    stand = {}
+    with os.scandir(weekmap) as items:
+        for item in items:
+            if item.is_file() and is_formulier(item.name) and not is_overzicht(item.name):
+                info = item.stat()
+                stand[item.name] = (info.st_mtime_ns, info.st_size)
+    return stand
+
+
+def overzicht_actueel(weekmap, weeknummer, onderdelen, stand):
+    # Alle overzichten bestaan en zijn nieuwer dan het nieuwste formulier
+    if not stand:
+        return True
+    nieuwste = max(mtime for mtime, _ in stand.values())
+    for o in onderdelen:
+        pad = os.path.join(weekmap, overzicht_naam(weeknummer, o))
+        if not os.path.exists(pad) or os.stat(pad).st_mtime_ns < nieuwste:
+            return False
+    return True
+
+
+def bewaken(weken=None, jaren=None, onderdelen=(onderdeel,), interval=5, rust=10, workers=None, exports=()):
+    # Blijft draaien (Ctrl+C stopt). Elke `interval` seconden wordt van elke weekmap de
+    # stand bekeken; een map met nieuwe, gewijzigde of verwijderde formulieren wordt
+    # opnieuw verwerkt zodra er `rust` seconden niets meer veranderd is. Een map die
+    # wordt volgezet geeft zo één nieuw overzicht, en een bestand dat nog gekopieerd wordt
+    # (groeiende grootte) wordt niet half gelezen. De index extraheert alleen wat nieuw is
+    verwerkt = {}  # weekmap -> stand bij de laatste verwerking
+    onrustig = {}  # weekmap -> (stand, tijdstip waarop die stand ontstond)
+
+    print(f"👀 Weekmappen in {FORMULIERENMAP} worden bewaakt (elke {interval} s, verwerken na {rust} s rust)")
+    while True:
+        nu = time.monotonic()
+        for jaar, week, pad in weekmappen(weken, jaren):
+            stand = map_stand(pad)
+            if pad not in verwerkt:
+                # Eerste keer: alleen bijwerken als een overzicht ontbreekt of verouderd is
+                verwerkt[pad] = stand if overzicht_actueel(pad, week, onderdelen, stand) else None
+
+            if stand == verwerkt[pad]:
+                onrustig.pop(pad, None)
+                continue
+            if pad not in onrustig or onrustig[pad][0] != stand:
+                onrustig[pad] = (stand, nu)
+                continue
+            if nu - onrustig[pad][1] < rust:
+                continue
+
+            # Ook bij een fout niet steeds opnieuw proberen, pas weer als de map verandert
+            del onrustig[pad]
+            verwerkt[pad] = stand
+            for o in onderdelen:
+                try:
+                    output_pad = verwerk_week(pad, week, o, jaar=jaar, workers=workers, exports=exports)
+                    print(f"{datetime.now():%H:%M:%S} ✅ Document opgeslagen als: {output_pad} ({len(stand)} formulieren)")
+                except Exception as e:
+                    print(f"{datetime.now():%H:%M:%S} ❌ Week {week}{f' ({jaar})' if jaar else ''}, {o}: {e}", file=sys.stderr)
+
+        time.sleep(interval)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maak de debriefingsoverzichten per week")
+    parser.add_argument("--weken", type=parse_bereik, help="weeknummers, bijv. 18-22,30 (standaard: vorige week)")
+    parser.add_argument("--jaren", type=parse_bereik, help="jaren, bijv. 2024-2025: mappen Debriefingsformulieren/JJJJ/WeekNN")
+    parser.add_argument("--alle", action="store_true", help="alle weekmappen")
+    parser.add_argument("--onderdelen", nargs="+", default=[onderdeel], choices=list(PROFIELEN), metavar="ONDERDEEL")
+    # Weken worden na elkaar verwerkt; blijft bestaan zodat oude aanroepen blijven werken
+    parser.add_argument("--gelijktijdig", type=int, default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--workers", type=int, default=None, help="extractieprocessen in totaal (standaard DEBRIEFINGS_WORKERS)")
+    parser.add_argument("--export", nargs="+", default=[], choices=beschikbare_formaten(), metavar="FORMAAT",
+                        help=f"observaties ook als tabel in de weekmap: {', '.join(beschikbare_formaten())}")
+    parser.add_argument("--bewaken", action="store_true",
+                        help="blijven draaien en een weekmap opnieuw verwerken als er formulieren bijkomen of wijzigen")
+    parser.add_argument("--interval", type=float, default=5, help="bij --bewaken: seconden tussen twee keer kijken")
+    parser.add_argument("--rust", type=float, default=10,
+                        help="bij --bewaken: zoveel seconden zonder wijzigingen voordat een map wordt verwerkt")
+    args = parser.parse_args(argv)
+
+    if args.bewaken:
+        # Standaard alle weekmappen, ook die er later bijkomen
         try:
-            return datetime.strptime(item[0], "%d-%m-%Y")
-        except Exception:
-            return datetime.min
-
-    resultaten[cat].sort(key=sorteersleutel)
-
-
-# for cat, items in resultaten.items():
-#     print(f"\n🟦 {cat.upper()}")
-#     if items:
-#         # Filter items waarbij tekst niet leeg is
-#         items_met_tekst = [item for item in items if item[2].strip() != ""]
-#         if items_met_tekst:
-#             for idx, (d, dienst, tekst) in enumerate(items_met_tekst, 1):
-#                 print(f"\n🔹 {d} ({dienst}):\n{tekst}")
-
-
-for cat, items in resultaten.items():
-    if items:
-        doc_out.add_heading(cat.upper(), level=1)
-        for datum, dienst, tekst in items:
-            doc_out.add_paragraph(f"{datum} ({dienst})", style='Heading 3')
-            for regel in tekst.split('\n'):
-                regel = regel.strip()
-                if regel:
-                    p = doc_out.add_paragraph(style='List Bullet')
-                    p.add_run(regel)
-
-output_pad = os.path.join(weekmap, f"Week {weeknummer} Debriefingsoverzicht.docx")
-doc_out.save(output_pad)
-
-print(f"✅ Document opgeslagen als: {output_pad}")
+            bewaken(args.weken, args.jaren, args.onderdelen, args.interval, args.rust, args.workers, args.export)
+        except KeyboardInterrupt:
+            print("Gestopt")
+        return
+
+    # Zonder opties: alleen vorige week, zoals altijd
+    if not (args.weken or args.jaren or args.alle) and args.onderdelen == [onderdeel]:
+        output_pad = verwerk_week(weekmap, weeknummer, workers=args.workers, exports=args.export)
+        print(f"✅ Document opgeslagen als: {output_pad}")
+        return
+
+    weken = args.weken
+    if not (weken or args.jaren or args.alle):
+        weken = {weeknummer}
+    if not inhalen(weken, args.jaren, args.onderdelen, args.workers, args.export):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,373 @@
+import multiprocessing
+import os
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from io import BytesIO
+from itertools import chain, islice
+from lxml import etree
+from categorie_matcher import compileer_matcher
+from datums import parse_datum
+
+# -------------------------------
+# Eén streaming pass over word/document.xml
+# -------------------------------
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+BODY = W + "body"
+TBL = W + "tbl"
+TR = W + "tr"
+TC = W + "tc"
+P = W + "p"
+R = W + "r"
+SDT = W + "sdt"
+
+# Label in de kop-tabel -> veld dat de waarde uit de cel ernaast krijgt
+KOPVELDEN = [
+    ("Datum dienst", "datum"),
+    ("datum dienst", "datum"),
+    ("Soort dienst", "dienst"),
+    ("Inzetgebied", "inzetgebied"),
+    ("Inzetlocatie", "inzetgebied"),
+]
+
+
+def _run_tekst(run):
+    # Zelfde vertaling als python-docx: tabs, regeleinden en koppeltekens als tekst
+    delen = []
+    for e in run:
+        tag = e.tag
+        if tag == W + "t":
+            delen.append(e.text or "")
+        elif tag == W + "tab" or tag == W + "ptab":
+            delen.append("\t")
+        elif tag == W + "br":
+            if e.get(W + "type", "textWrapping") == "textWrapping":
+                delen.append("\n")
+        elif tag == W + "cr":
+            delen.append("\n")
+        elif tag == W + "noBreakHyphen":
+            delen.append("-")
+    return "".join(delen)
+
+
+def _alinea_tekst(p):
+    delen = []
+    for e in p:
+        if e.tag == R:
+            delen.append(_run_tekst(e))
+        elif e.tag == W + "hyperlink":
+            delen.extend(_run_tekst(r) for r in e if r.tag == R)
+    return "".join(delen)
+
+
+def _cel_tekst(tc):
+    return "\n".join(_alinea_tekst(p) for p in tc if p.tag == P)
+
+
+def _cel_eigenschap(tc, naam):
+    tcPr = tc.find(W + "tcPr")
+    if tcPr is None:
+        return None
+    return tcPr.find(W + naam)
+
+
+def _rij_cellen(tr, vorige_rij):
+    # Elke w:tc van de rij één keer, als (kolom, span, tekst): kolom is de positie in
+    # het tabelraster (na gridBefore), span het aantal kolommen (gridSpan). Een
+    # verticaal samengevoegde cel (vMerge) neemt de tekst van de cel erboven over, zoals
+    # row.cells; anders dan row.cells wordt een brede cel niet per kolom herhaald.
+    # vorige_rij/per_kolom: tekst per startkolom, voor de vMerge van de volgende rij
+    cellen = []
+    per_kolom = {}
+
+    kolom = 0
+    trPr = tr.find(W + "trPr")
+    if trPr is not None:
+        grid_before = trPr.find(W + "gridBefore")
+        if grid_before is not None:
+            kolom = int(grid_before.get(W + "val", 0))
+
+    for tc in tr:
+        if tc.tag != TC:
+            continue
+
+        grid_span = _cel_eigenschap(tc, "gridSpan")
+        span = int(grid_span.get(W + "val", 1)) if grid_span is not None else 1
+
+        v_merge = _cel_eigenschap(tc, "vMerge")
+        if v_merge is not None and v_merge.get(W + "val", "continue") == "continue":
+            tekst = vorige_rij.get(kolom, "")
+        else:
+            tekst = _cel_tekst(tc)
+
+        per_kolom[kolom] = tekst
+        cellen.append((kolom, span, tekst))
+        kolom += span
+
+    return cellen, per_kolom
+
+
+def _is_datumveld(sdt):
+    sdtPr = sdt.find(W + "sdtPr")
+    return sdtPr is not None and sdtPr.find(".//" + W + "date") is not None
+
+
+# Stappen die extraheer_formulier meet als er een tijden-dict wordt meegegeven
+STAPPEN = ("unzip", "xml", "kopvelden", "categorieen")
+
+
+def buiten_week(datum, week):
+    # week: (jaar, ISO-weeknummer). Een datum die niet te lezen is valt er niet buiten
+    d = parse_datum(datum)
+    return d is not None and tuple(d.isocalendar()[:2]) != tuple(week)
+
+
+def extraheer_formulier(bron, categorieen, kopvelden=KOPVELDEN, tijden=None, week=None):
+    # bron: pad of (in-memory) bestandsobject van een .docx
+    # Geeft (velden, treffers) terug: velden met datum/dienst/inzetgebied en
+    # treffers als lijst van (categorie, tekst uit de rij onder de categorie)
+    # tijden: optioneel dict dat per stap (STAPPEN) de duur in seconden krijgt
+    # week: (jaar, weeknummer); zodra de datum bekend is en daarbuiten valt, stopt
+    # het lezen en zijn de treffers None
+    start = time.perf_counter()
+    meten = tijden is not None
+    if meten:
+        tijden.update(dict.fromkeys(STAPPEN, 0.0))
+
+    matcher = compileer_matcher(categorieen)
+
+    velden = {"datum": None, "dienst": None, "inzetgebied": None}
+    datumvelden = []
+    treffers = []
+
+    open_categorieen = []
+    vorige_rij = {}
+
+    # De datum staat in de kop-tabel, of anders in een datumkiezer daarna
+    na_eerste_tabel = False
+    datum_beslist = week is None
+    overgeslagen = False
+
+    with zipfile.ZipFile(bron) as docx_zip:
+        with docx_zip.open("word/document.xml") as xml_file:
+            if meten:
+                tijden["unzip"] = time.perf_counter() - start
+            for _, elem in etree.iterparse(xml_file, events=("end",), tag=(TR, TBL, SDT, P)):
+                ouder = elem.getparent()
+
+                if elem.tag == SDT:
+                    # Datumkiezer (w:sdt met w:date)
+                    if _is_datumveld(elem):
+                        datumvelden.append("".join(t.text for t in elem.iter(W + "t") if t.text))
+                        if not datum_beslist and na_eerste_tabel and velden["datum"] is None:
+                            datum_beslist = True
+                            if buiten_week(datumvelden[0], week):
+                                overgeslagen = True
+                                break
+
+                elif elem.tag == TR:
+                    # Alleen rijen van tabellen direct in de body, zoals doc.tables
+                    if ouder.tag != TBL or ouder.getparent().tag != BODY:
+                        continue
+
+                    cellen, vorige_rij = _rij_cellen(elem, vorige_rij)
+                    if meten:
+                        t0 = time.perf_counter()
+
+                    # Zoek datum, dienst en inzetgebied: de waarde staat in de cel na het label
+                    for i in range(len(cellen) - 1):
+                        tekst = cellen[i][2]
+                        for label, veld in kopvelden:
+                            if label in tekst:
+                                velden[veld] = cellen[i + 1][2].strip()
+
+                    if meten:
+                        t1 = time.perf_counter()
+                        tijden["kopvelden"] += t1 - t0
+
+                    # Antwoord op de categorieën uit de vorige rij
+                    if open_categorieen:
+                        tekst_volgende_rij = cellen[0][2].strip() if cellen else ""
+                        if tekst_volgende_rij:
+                            for cat in open_categorieen:
+                                treffers.append((cat, tekst_volgende_rij))
+
+                    rij_tekst = " ".join(tekst.strip() for _, _, tekst in cellen)
+                    open_categorieen = matcher.zoek(rij_tekst)
+                    if meten:
+                        tijden["categorieen"] += time.perf_counter() - t1
+
+                    # Verwerkte rijen opruimen
+                    elem.clear()
+                    while elem.getprevious() is not None:
+                        del ouder[0]
+                    continue
+
+                elif elem.tag == TBL and ouder.tag == BODY:
+                    open_categorieen = []
+                    vorige_rij = {}
+                    na_eerste_tabel = True
+
+                    datum = velden["datum"] if velden["datum"] is not None else next(iter(datumvelden), None)
+                    if not datum_beslist and datum is not None:
+                        datum_beslist = True
+                        if buiten_week(datum, week):
+                            overgeslagen = True
+                            break
+
+                if ouder is not None and ouder.tag == BODY:
+                    elem.clear()
+                    while elem.getprevious() is not None:
+                        del ouder[0]
+
+    # Een ingevuld "Datum dienst" gaat voor de datumkiezer
+    if velden["datum"] is None and datumvelden:
+        velden["datum"] = datumvelden[0]
+
+    if meten:
+        # Wat overblijft is het parsen van de XML en het opbouwen van de celteksten
+        tijden["xml"] = time.perf_counter() - start - tijden["unzip"] - tijden["kopvelden"] - tijden["categorieen"]
+
+    if overgeslagen:
+        return velden, None
+    return velden, treffers
+
+
+# -------------------------------
+# Meerdere formulieren over een process pool
+# -------------------------------
+def aantal_workers():
+    # Instelbaar via DEBRIEFINGS_WORKERS, standaard het aantal cores
+    try:
+        return max(1, int(os.environ["DEBRIEFINGS_WORKERS"]))
+    except (KeyError, ValueError):
+        return os.cpu_count() or 1
+
+
+# Workers niet met fork starten: de pool wordt vanuit een thread van Streamlit (of een
+# Taak) gemaakt, en een fork van een proces met threads kan in het kind vastlopen op een
+# lock die een andere thread vasthield. forkserver waar het kan (Linux), anders spawn
+_START = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def _pool(workers):
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(_START))
+
+
+def gedeelde_pool(workers=None):
+    # Eén pool voor meerdere aanroepen van stroom_formulieren(..., pool=...), bijv. week
+    # na week bij het inhalen: de workers starten één keer. Met één worker geen pool (None)
+    workers = workers or aantal_workers()
+    return _pool(workers) if workers > 1 else nullcontext()
+
+
+def _extraheer_taak(taak):
+    bron, categorieen, kopvelden, meten, week = taak
+    if isinstance(bron, bytes):
+        bron = BytesIO(bron)
+    tijden = {} if meten else None
+    return extraheer_formulier(bron, categorieen, kopvelden, tijden, week), tijden
+
+
+def extraheer_formulieren(bronnen, categorieen, kopvelden=KOPVELDEN, workers=None, tijden=None, week=None):
+    # bronnen: paden of bytes; de resultaten komen in dezelfde volgorde terug
+    # tijden: optionele lijst die per bron de gemeten stappen krijgt
+    # week: zie extraheer_formulier
+    bronnen = list(bronnen)
+    taken = [(bron, tuple(categorieen), kopvelden, tijden is not None, week) for bron in bronnen]
+    workers = min(workers or aantal_workers(), len(bronnen))
+
+    if workers <= 1:
+        uitkomsten = [_extraheer_taak(taak) for taak in taken]
+    else:
+        chunksize = max(1, len(taken) // (workers * 4))
+        with _pool(workers) as pool:
+            uitkomsten = list(pool.map(_extraheer_taak, taken, chunksize=chunksize))
+
+    if tijden is not None:
+        tijden.extend(gemeten for _, gemeten in uitkomsten)
+    return [resultaat for resultaat, _ in uitkomsten]
+
+
+def stroom_formulieren(bronnen, categorieen, kopvelden=KOPVELDEN, workers=None, tijden=None, venster=None, week=None,
+                       pool=None):
+    # Zoals extraheer_formulieren, maar bronnen mag een generator zijn: er worden nooit
+    # meer dan `venster` bronnen tegelijk vastgehouden. Resultaten komen in volgorde terug.
+    # pool: een pool uit gedeelde_pool() met `workers` processen; blijft na afloop open
+    workers = workers or aantal_workers()
+    meten = tijden is not None
+    taken = ((bron, tuple(categorieen), kopvelden, meten, week) for bron in bronnen)
+
+    # Niet meer processen dan bronnen: de eerste `workers` bronnen alvast ophalen; zijn het
+    # er minder, dan is dat het aantal (één formulier wordt zonder pool gelezen)
+    eerste = list(islice(taken, workers))
+    workers = min(workers, len(eerste))
+    taken = chain(eerste, taken)
+    venster = venster or workers * 2
+
+    if workers <= 1:
+        for taak in taken:
+            resultaat, gemeten = _extraheer_taak(taak)
+            if meten:
+                tijden.append(gemeten)
+            yield resultaat
+        return
+
+    with nullcontext(pool) if pool is not None else _pool(workers) as pool:
+        lopend = deque()
+        for taak in taken:
+            lopend.append(pool.submit(_extraheer_taak, taak))
+            while len(lopend) >= venster:
+                resultaat, gemeten = lopend.popleft().result()
+                if meten:
+                    tijden.append(gemeten)
+                yield resultaat
+        while lopend:
+            resultaat, gemeten = lopend.popleft().result()
+            if meten:
+                tijden.append(gemeten)
+            yield resultaat
+
+
+# -------------------------------
+# Formulieren uit een zip (bijv. een hele weekmap)
+# -------------------------------
+def is_formulier(naam):
+    # Alleen .docx; geen mappen, Word-lockbestanden (~$...) of macOS-metadata
+    basis = os.path.basename(naam)
+    return (
+        naam.lower().endswith(".docx")
+        and not basis.startswith(("~$", "._"))
+        and not naam.startswith("__MACOSX/")
+    )
+
+
+def is_overzicht(naam):
+    # Eerder gemaakte overzichten staan in dezelfde map, maar zijn geen formulier
+    return "Debriefingsoverzicht" in os.path.basename(naam)
+
+
+def _zip_leden(archief):
+    # Een gezipte weekmap bevat vaak ook het overzicht van die week
+    return [
+        info for info in sorted(archief.infolist(), key=lambda info: info.filename)
+        if not info.is_dir() and is_formulier(info.filename) and not is_overzicht(info.filename)
+    ]
+
+
+def zip_formulieren(bestand):
+    # bestand: pad of bestandsobject van een .zip. Geeft (naam, bytes) per .docx,
+    # één lid tegelijk en op naam (zoals een gesorteerde map); de zip zelf wordt niet
+    # uitgepakt of gekopieerd
+    with zipfile.ZipFile(bestand) as archief:
+        for info in _zip_leden(archief):
+            yield os.path.basename(info.filename), archief.read(info)
+
+
+def zip_aantal(bestand):
+    # Aantal formulieren in de zip, alleen uit de inhoudsopgave
+    with zipfile.ZipFile(bestand) as archief:
+        return len(_zip_leden(archief))
@@ -0,0 +1,76 @@
+import csv
+import io
+import json
+from operator import attrgetter
+
+# Parquet alleen als pyarrow er is (pip install pyarrow); CSV en JSON Lines altijd
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+# -------------------------------
+# Observaties als tabel (CSV, JSON Lines, Parquet) voor analyse buiten Word
+# -------------------------------
+# Eén rij per observatie, op datum en dienst zoals in de overzichten. datum is de tekst
+# uit het formulier, dag dezelfde datum als ISO-datum (leeg als die niet te lezen is)
+KOLOMMEN = ("onderdeel", "datum", "dag", "dienst", "inzetgebied", "categorie", "tekst", "bestand")
+_DAG = KOLOMMEN.index("dag")
+
+
+def export_rijen(profiel, resultaten):
+    # resultaten uit verzamel(); tuples in de volgorde van KOLOMMEN
+    observaties = sorted((obs for items in resultaten.values() for obs in items), key=attrgetter("sleutel"))
+    return [
+        (profiel.naam, obs.datum, obs.dag, obs.dienst, obs.inzetgebied, obs.categorie, obs.tekst, obs.bestand)
+        for obs in observaties
+    ]
+
+
+def naar_csv(rijen):
+    # Met BOM, zodat Excel de tekens goed leest
+    buffer = io.StringIO(newline="")
+    schrijver = csv.writer(buffer)
+    schrijver.writerow(KOLOMMEN)
+    for rij in rijen:
+        rij = list(rij)
+        rij[_DAG] = rij[_DAG].isoformat() if rij[_DAG] else None
+        schrijver.writerow(rij)
+    return buffer.getvalue().encode("utf-8-sig")
+
+
+def naar_jsonl(rijen):
+    regels = []
+    for rij in rijen:
+        regel = dict(zip(KOLOMMEN, rij))
+        regel["dag"] = regel["dag"].isoformat() if regel["dag"] else None
+        regels.append(json.dumps(regel, ensure_ascii=False))
+    return ("\n".join(regels) + "\n" if regels else "").encode("utf-8")
+
+
+def naar_parquet(rijen):
+    if pa is None:
+        raise RuntimeError("Parquet-export heeft pyarrow nodig (pip install pyarrow)")
+    kolommen = list(zip(*rijen)) or [()] * len(KOLOMMEN)
+    schema = pa.schema([(kolom, pa.date32() if kolom == "dag" else pa.string()) for kolom in KOLOMMEN])
+    tabel = pa.table({kolom: list(waarden) for kolom, waarden in zip(KOLOMMEN, kolommen)}, schema=schema)
+    buffer = io.BytesIO()
+    pq.write_table(tabel, buffer, compression="zstd")
+    return buffer.getvalue()
+
+
+# formaat: (extensie, mime-type, schrijver)
+FORMATEN = {
+    "csv": ("csv", "text/csv", naar_csv),
+    "jsonl": ("jsonl", "application/x-ndjson", naar_jsonl),
+    "parquet": ("parquet", "application/vnd.apache.parquet", naar_parquet),
+}
+
+
+def beschikbare_formaten():
+    return [formaat for formaat in FORMATEN if formaat != "parquet" or pa is not None]
+
+
+def exporteer(rijen, formaat):
+    return FORMATEN[formaat][2](rijen)
@@ -0,0 +1,96 @@
+import json
+import os
+import statistics
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+
+# -------------------------------
+# Tijdmeting per stap, per bestand en per run
+# -------------------------------
+# Per run: cache, lezen, extractie, index, verzamelen, rapport, export (wandkloktijd)
+# Per bestand: unzip, xml, kopvelden, categorieen (uit docx_extractie)
+# Met DEBRIEFINGS_METING_LOG=<pad> (of "-" voor stdout) komt elke run als JSON-regels in dat bestand
+LOG_VARIABELE = "DEBRIEFINGS_METING_LOG"
+
+# Een bestand dat zoveel keer langer duurt dan de mediaan valt op
+TRAAG_FACTOR = 3
+
+
+def log_pad():
+    return os.environ.get(LOG_VARIABELE) or None
+
+
+class Meting:
+
+    def __init__(self, script, bestanden_meten=True):
+        self.script = script
+        # Per-bestand meten kost een paar procent extractietijd, dus alleen op verzoek
+        self.bestanden_meten = bestanden_meten
+        self.tijdstip = datetime.now().isoformat(timespec="seconds")
+        self.stappen = defaultdict(float)
+        # [(naam, tijden)] in verwerkingsvolgorde; twee bestanden kunnen dezelfde naam
+        # hebben (uit verschillende zips), dus op volgnummer en niet op naam
+        self.bestanden = []
+        self._start = time.perf_counter()
+        self._eind = None
+
+    @contextmanager
+    def stap(self, naam):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stappen[naam] += time.perf_counter() - start
+
+    def extractie_tijden(self):
+        # Lijst voor extraheer_formulieren(..., tijden=...), of None als er niet per bestand gemeten wordt
+        return [] if self.bestanden_meten else None
+
+    def voeg_bestanden_toe(self, namen, tijden):
+        # tijden: per bestand een dict per stap zoals extraheer_formulier die vult
+        for naam, gemeten in zip(namen, tijden or []):
+            self.bestanden.append((naam, dict(gemeten)))
+
+    def afronden(self):
+        # Run klaar: het totaal blijft staan, ook als het resultaat later nog eens getoond wordt
+        self._eind = time.perf_counter()
+
+    def totaal(self):
+        return (self._eind or time.perf_counter()) - self._start
+
+    def per_bestand(self):
+        # [(volgnummer, naam, totaal, tijden)], traagste eerst
+        rijen = [(i, naam, sum(tijden.values()), tijden) for i, (naam, tijden) in enumerate(self.bestanden)]
+        return sorted(rijen, key=lambda rij: rij[2], reverse=True)
+
+    def trage_bestanden(self):
+        # [(volgnummer, naam, totaal)]
+        rijen = self.per_bestand()
+        if len(rijen) < 3:
+            return []
+        mediaan = statistics.median(totaal for _, _, totaal, _ in rijen)
+        return [(i, naam, totaal) for i, naam, totaal, _ in rijen if totaal > TRAAG_FACTOR * mediaan]
+
+    def json_regels(self):
+        basis = {"tijdstip": self.tijdstip, "script": self.script}
+        regels = [dict(basis, soort="run", totaal_s=round(self.totaal(), 4), bestanden=len(self.bestanden),
+                       **{f"{stap}_s": round(duur, 4) for stap, duur in self.stappen.items()})]
+        for i, naam, totaal, tijden in self.per_bestand():
+            regels.append(dict(basis, soort="bestand", volgnummer=i, bestand=naam, totaal_s=round(totaal, 4),
+                               **{f"{stap}_s": round(duur, 4) for stap, duur in tijden.items()}))
+        return [json.dumps(regel, ensure_ascii=False) for regel in regels]
+
+    def schrijf_log(self, pad=None):
+        pad = pad or log_pad()
+        if not pad:
+            return
+        regels = "\n".join(self.json_regels()) + "\n"
+        if pad == "-":
+            sys.stdout.write(regels)
+            sys.stdout.flush()
+        else:
+            with open(pad, "a", encoding="utf-8") as f:
+                f.write(regels)
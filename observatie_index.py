@@ -0,0 +1,576 @@
+import hashlib
+import os
+import sqlite3
+
+from datums import dagdeel, parse_datum
+from docx_extractie import KOPVELDEN, stroom_formulieren
+from overzicht import dienst_sleutel, dubbel_sleutel
+from profielen import profiel_sleutel
+
+# -------------------------------
+# Lokale opslag van geëxtraheerde observaties
+# -------------------------------
+STANDAARD_PAD = os.path.join("Debriefingsformulieren", "observaties.sqlite")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bestanden (
+    pad TEXT NOT NULL,
+    profiel TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    grootte INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    PRIMARY KEY (pad, profiel)
+);
+
+CREATE TABLE IF NOT EXISTS observaties (
+    id INTEGER PRIMARY KEY,
+    hash TEXT NOT NULL,
+    profiel TEXT NOT NULL,
+    onderdeel TEXT,
+    volgnummer INTEGER NOT NULL,
+    datum TEXT,
+    dienst TEXT,
+    inzetgebied TEXT,
+    categorie TEXT NOT NULL,
+    tekst TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_observaties_hash ON observaties (hash, profiel, volgnummer);
+"""
+
+# Versie 2: datum als ISO-tekst en full-text index voor de zoekpagina
+SCHEMA_V2 = """
+ALTER TABLE observaties ADD COLUMN datum_iso TEXT;
+
+CREATE INDEX idx_observaties_datum ON observaties (datum_iso);
+CREATE INDEX idx_observaties_filter ON observaties (onderdeel, categorie);
+
+CREATE VIRTUAL TABLE observaties_fts USING fts5(
+    tekst, categorie, inzetgebied,
+    content='observaties', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER observaties_ai AFTER INSERT ON observaties BEGIN
+    INSERT INTO observaties_fts (rowid, tekst, categorie, inzetgebied)
+    VALUES (new.id, new.tekst, new.categorie, new.inzetgebied);
+END;
+
+CREATE TRIGGER observaties_ad AFTER DELETE ON observaties BEGIN
+    INSERT INTO observaties_fts (observaties_fts, rowid, tekst, categorie, inzetgebied)
+    VALUES ('delete', old.id, old.tekst, old.categorie, old.inzetgebied);
+END;
+"""
+
+# Versie 3: aantallen per categorie × ISO-week × onderdeel × inzetgebied × dagdeel voor
+# de trendpagina. De triggers houden ze bij bij elke insert/delete van een observatie,
+# dus een grafiek over een heel jaar leest alleen deze (kleine) tabel
+SCHEMA_V3 = """
+ALTER TABLE observaties ADD COLUMN iso_jaar INTEGER;
+ALTER TABLE observaties ADD COLUMN iso_week INTEGER;
+ALTER TABLE observaties ADD COLUMN dagdeel TEXT;
+
+CREATE TABLE trends (
+    profiel TEXT NOT NULL,
+    onderdeel TEXT NOT NULL,
+    categorie TEXT NOT NULL,
+    iso_jaar INTEGER NOT NULL,
+    iso_week INTEGER NOT NULL,
+    inzetgebied TEXT NOT NULL,
+    dagdeel TEXT NOT NULL,
+    aantal INTEGER NOT NULL,
+    PRIMARY KEY (profiel, onderdeel, categorie, iso_jaar, iso_week, inzetgebied, dagdeel)
+) WITHOUT ROWID;
+
+CREATE INDEX idx_trends_week ON trends (iso_jaar, iso_week);
+
+CREATE TRIGGER trends_ai AFTER INSERT ON observaties BEGIN
+    INSERT INTO trends (profiel, onderdeel, categorie, iso_jaar, iso_week, inzetgebied, dagdeel, aantal)
+    VALUES (new.profiel, coalesce(new.onderdeel, ''), new.categorie, coalesce(new.iso_jaar, 0),
+            coalesce(new.iso_week, 0), coalesce(new.inzetgebied, ''), coalesce(new.dagdeel, ''), 1)
+    ON CONFLICT (profiel, onderdeel, categorie, iso_jaar, iso_week, inzetgebied, dagdeel)
+    DO UPDATE SET aantal = aantal + 1;
+END;
+
+CREATE TRIGGER trends_ad AFTER DELETE ON observaties BEGIN
+    UPDATE trends SET aantal = aantal - 1
+    WHERE profiel = old.profiel AND onderdeel = coalesce(old.onderdeel, '') AND categorie = old.categorie
+      AND iso_jaar = coalesce(old.iso_jaar, 0) AND iso_week = coalesce(old.iso_week, 0)
+      AND inzetgebied = coalesce(old.inzetgebied, '') AND dagdeel = coalesce(old.dagdeel, '');
+    DELETE FROM trends
+    WHERE profiel = old.profiel AND onderdeel = coalesce(old.onderdeel, '') AND categorie = old.categorie
+      AND iso_jaar = coalesce(old.iso_jaar, 0) AND iso_week = coalesce(old.iso_week, 0)
+      AND inzetgebied = coalesce(old.inzetgebied, '') AND dagdeel = coalesce(old.dagdeel, '')
+      AND aantal <= 0;
+END;
+"""
+
+# Versie 4: welke formulieren (hash) in een geschreven overzicht staan, zodat
+# debriefings.py een overzicht kan aanvullen in plaats van opnieuw maken. mtime_ns en
+# grootte zijn die van het overzicht zelf: is het daarna nog gewijzigd, dan telt het niet
+SCHEMA_V4 = """
+CREATE TABLE overzichten (
+    pad TEXT PRIMARY KEY,
+    profiel TEXT NOT NULL,
+    weergave TEXT NOT NULL,
+    titel TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    grootte INTEGER NOT NULL
+);
+
+CREATE TABLE overzicht_bestanden (
+    pad TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    PRIMARY KEY (pad, hash)
+) WITHOUT ROWID;
+"""
+
+# Versie 5: trends tellen elke observatie één keer, zoals verzamel() in de overzichten.
+# dubbel is dezelfde digest als daar (dag, dagdeel, inzetgebied, categorie en tekst);
+# van observaties met dezelfde digest telt er één (telt = 1). Verdwijnt die, dan telt
+# de volgende met dezelfde digest (trends_ad zet telt, trends_au telt hem op)
+SCHEMA_V5 = """
+ALTER TABLE observaties ADD COLUMN dubbel BLOB;
+ALTER TABLE observaties ADD COLUMN telt INTEGER NOT NULL DEFAULT 0;
+
+CREATE INDEX idx_observaties_dubbel ON observaties (profiel, dubbel);
+
+DROP TRIGGER trends_ai;
+DROP TRIGGER trends_ad;
+
+CREATE TRIGGER trends_ai AFTER INSERT ON observaties
+WHEN NOT EXISTS (
+    SELECT 1 FROM observaties
+    WHERE profiel = new.profiel AND dubbel = new.dubbel AND onderdeel IS new.onderdeel AND telt = 1
+)
+BEGIN
+    UPDATE observaties SET telt = 1 WHERE id = new.id;
+END;
+
+CREATE TRIGGER trends_au AFTER UPDATE OF telt ON observaties WHEN new.telt = 1 AND old.telt = 0 BEGIN
+    INSERT INTO trends (profiel, onderdeel, categorie, iso_jaar, iso_week, inzetgebied, dagdeel, aantal)
+    VALUES (new.profiel, coalesce(new.onderdeel, ''), new.categorie, coalesce(new.iso_jaar, 0),
+            coalesce(new.iso_week, 0), coalesce(new.inzetgebied, ''), coalesce(new.dagdeel, ''), 1)
+    ON CONFLICT (profiel, onderdeel, categorie, iso_jaar, iso_week, inzetgebied, dagdeel)
+    DO UPDATE SET aantal = aantal + 1;
+END;
+
+CREATE TRIGGER trends_ad AFTER DELETE ON observaties WHEN old.telt = 1 BEGIN
+    UPDATE trends SET aantal = aantal - 1
+    WHERE profiel = old.profiel AND onderdeel = coalesce(old.onderdeel, '') AND categorie = old.categorie
+      AND iso_jaar = coalesce(old.iso_jaar, 0) AND iso_week = coalesce(old.iso_week, 0)
+      AND inzetgebied = coalesce(old.inzetgebied, '') AND dagdeel = coalesce(old.dagdeel, '');
+    DELETE FROM trends
+    WHERE profiel = old.profiel AND onderdeel = coalesce(old.onderdeel, '') AND categorie = old.categorie
+      AND iso_jaar = coalesce(old.iso_jaar, 0) AND iso_week = coalesce(old.iso_week, 0)
+      AND inzetgebied = coalesce(old.inzetgebied, '') AND dagdeel = coalesce(old.dagdeel, '')
+      AND aantal <= 0;
+    UPDATE observaties SET telt = 1
+    WHERE id = (
+        SELECT MIN(id) FROM observaties
+        WHERE profiel = old.profiel AND dubbel = old.dubbel AND onderdeel IS old.onderdeel
+    );
+END;
+"""
+
+# Versie 6: de kopvelden per bestand, ook van formulieren zonder observaties (tot nu
+# toe kwamen ze uit de eerste observatie)
+SCHEMA_V6 = """
+ALTER TABLE bestanden ADD COLUMN datum TEXT;
+ALTER TABLE bestanden ADD COLUMN dienst TEXT;
+ALTER TABLE bestanden ADD COLUMN inzetgebied TEXT;
+"""
+
+TREND_KOLOMMEN = ("categorie", "onderdeel", "inzetgebied", "dagdeel")
+
+
+def _voer_script_uit(conn, script):
+    # executescript() commit eerst; dit voert de statements uit binnen de lopende transactie
+    statement = ""
+    for regel in script.splitlines(keepends=True):
+        statement += regel
+        if sqlite3.complete_statement(statement):
+            conn.execute(statement)
+            statement = ""
+
+
+def _datum_iso(datum):
+    d = parse_datum(datum)
+    return d.isoformat() if d else None
+
+
+def _iso_week(datum):
+    # (jaar, week) volgens ISO, of (None, None) als de datum niet te lezen is
+    d = parse_datum(datum)
+    return tuple(d.isocalendar())[:2] if d else (None, None)
+
+
+def _fts_zoekterm(zoekterm):
+    # Elk woord als los FTS-token (tussen quotes), zodat leestekens geen syntaxfout geven;
+    # een * aan het eind zoekt op woordbegin
+    termen = []
+    for woord in zoekterm.split():
+        prefix = woord.endswith("*")
+        woord = woord.rstrip("*").replace('"', '""')
+        if woord:
+            termen.append('"' + woord + '"' + ("*" if prefix else ""))
+    return " ".join(termen)
+
+
+class ObservatieIndex:
+
+    def __init__(self, pad=STANDAARD_PAD):
+        self.pad = pad
+        self.conn = sqlite3.connect(pad, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self._migreren()
+
+    def _migreren(self):
+        # Onder een schrijflock, zodat gelijktijdige processen/threads niet allebei migreren
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            versie = self.conn.execute("PRAGMA user_version").fetchone()[0]
+            if versie < 1:
+                _voer_script_uit(self.conn, SCHEMA)
+            if versie < 2:
+                _voer_script_uit(self.conn, SCHEMA_V2)
+                rijen = self.conn.execute("SELECT id, datum FROM observaties").fetchall()
+                self.conn.executemany(
+                    "UPDATE observaties SET datum_iso = ? WHERE id = ?",
+                    [(_datum_iso(datum), rij_id) for rij_id, datum in rijen],
+                )
+                self.conn.execute("INSERT INTO observaties_fts (observaties_fts) VALUES ('rebuild')")
+                self.conn.execute("PRAGMA user_version = 2")
+            if versie < 3:
+                _voer_script_uit(self.conn, SCHEMA_V3)
+                rijen = self.conn.execute("SELECT id, datum, dienst FROM observaties").fetchall()
+                self.conn.executemany(
+                    "UPDATE observaties SET iso_jaar = ?, iso_week = ?, dagdeel = ? WHERE id = ?",
+                    [(*_iso_week(datum), dagdeel(dienst), rij_id) for rij_id, datum, dienst in rijen],
+                )
+                # Bestaande observaties in één keer optellen; daarna doen de triggers het
+                self.conn.execute("""
+                    INSERT INTO trends (profiel, onderdeel, categorie, iso_jaar, iso_week, inzetgebied, dagdeel, aantal)
+                    SELECT profiel, coalesce(onderdeel, ''), categorie, coalesce(iso_jaar, 0), coalesce(iso_week, 0),
+                           coalesce(inzetgebied, ''), coalesce(dagdeel, ''), COUNT(*)
+                    FROM observaties
+                    GROUP BY 1, 2, 3, 4, 5, 6, 7
+                """)
+                self.conn.execute("PRAGMA user_version = 3")
+            if versie < 4:
+                _voer_script_uit(self.conn, SCHEMA_V4)
+                self.conn.execute("PRAGMA user_version = 4")
+            if versie < 5:
+                _voer_script_uit(self.conn, SCHEMA_V5)
+                rijen = self.conn.execute("SELECT id, datum, dienst, inzetgebied, categorie, tekst FROM observaties").fetchall()
+                self.conn.executemany(
+                    "UPDATE observaties SET dubbel = ? WHERE id = ?",
+                    [(dubbel_sleutel(dienst_sleutel(datum, dienst, inzetgebied), cat, tekst), rij_id)
+                     for rij_id, datum, dienst, inzetgebied, cat, tekst in rijen],
+                )
+                # Opnieuw tellen: de eerste van elke digest telt (trends_au)
+                self.conn.execute("DELETE FROM trends")
+                self.conn.execute(
+                    "UPDATE observaties SET telt = 1 "
+                    "WHERE id IN (SELECT MIN(id) FROM observaties GROUP BY profiel, onderdeel, dubbel)"
+                )
+                self.conn.execute("PRAGMA user_version = 5")
+            if versie < 6:
+                _voer_script_uit(self.conn, SCHEMA_V6)
+                self.conn.execute("""
+                    UPDATE bestanden SET (datum, dienst, inzetgebied) = (
+                        SELECT datum, dienst, inzetgebied FROM observaties o
+                        WHERE o.hash = bestanden.hash AND o.profiel = bestanden.profiel
+                        ORDER BY volgnummer LIMIT 1
+                    )
+                """)
+                # Formulieren zonder observaties: kopvelden onbekend, dus bij het volgende
+                # bijwerken() opnieuw lezen. Uploads zijn er niet meer, die blijven zonder
+                self.conn.execute("""
+                    DELETE FROM bestanden
+                    WHERE pad NOT LIKE 'upload:%'
+                      AND NOT EXISTS (SELECT 1 FROM observaties o WHERE o.hash = bestanden.hash AND o.profiel = bestanden.profiel)
+                """)
+                self.conn.execute("PRAGMA user_version = 6")
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _velden(self, bestand_hash, profiel):
+        # Kopvelden zoals opgeslagen bij een bestand met deze inhoud (versie 6)
+        rij = self.conn.execute(
+            "SELECT datum, dienst, inzetgebied FROM bestanden WHERE hash = ? AND profiel = ? LIMIT 1",
+            (bestand_hash, profiel),
+        ).fetchone()
+        return dict(zip(("datum", "dienst", "inzetgebied"), rij or (None, None, None)))
+
+    def _observaties(self, bestand_hash, profiel):
+        rijen = self.conn.execute(
+            "SELECT categorie, tekst FROM observaties WHERE hash = ? AND profiel = ? ORDER BY volgnummer",
+            (bestand_hash, profiel),
+        ).fetchall()
+        return self._velden(bestand_hash, profiel), rijen
+
+    def _opslaan(self, bestand_hash, profiel, onderdeel, velden, treffers):
+        datum_iso = _datum_iso(velden["datum"])
+        iso_jaar, iso_week = _iso_week(velden["datum"])
+        deel = dagdeel(velden["dienst"])
+        kop = dienst_sleutel(velden["datum"], velden["dienst"], velden["inzetgebied"])
+        self.conn.execute(
+            "DELETE FROM observaties WHERE hash = ? AND profiel = ?", (bestand_hash, profiel)
+        )
+        self.conn.executemany(
+            "INSERT INTO observaties (hash, profiel, onderdeel, volgnummer, datum, datum_iso, iso_jaar, iso_week, "
+            "dienst, dagdeel, inzetgebied, categorie, tekst, dubbel) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (bestand_hash, profiel, onderdeel, i, velden["datum"], datum_iso, iso_jaar, iso_week,
+                 velden["dienst"], deel, velden["inzetgebied"], cat, tekst, dubbel_sleutel(kop, cat, tekst))
+                for i, (cat, tekst) in enumerate(treffers)
+            ],
+        )
+
+    def _is_verwerkt(self, bestand_hash, profiel):
+        # Deze inhoud is al eens verwerkt (eventueel onder een andere naam)
+        return self.conn.execute(
+            "SELECT 1 FROM bestanden WHERE hash = ? AND profiel = ? LIMIT 1",
+            (bestand_hash, profiel),
+        ).fetchone() is not None
+
+    def bijwerken(self, paden, categorieen, kopvelden=KOPVELDEN, onderdeel=None, workers=None, mappen=None, pool=None):
+        # Verwerkt alleen nieuwe of gewijzigde bestanden (mtime/grootte, daarna hash) en
+        # geeft voor elk pad (velden, treffers) terug, net als extraheer_formulieren.
+        # mappen: de gescande map(pen), waar paden alle formulieren van zijn; wat daar
+        # niet meer staat wordt vergeten, ook als een map leeg is. Zonder: de mappen van paden.
+        # pool: zie stroom_formulieren
+        profiel = profiel_sleutel(categorieen, kopvelden)
+        paden = list(paden)
+
+        hashes = {}
+        gewijzigd = []
+        te_verwerken = {}
+        for pad in paden:
+            stat = os.stat(pad)
+            rij = self.conn.execute(
+                "SELECT mtime_ns, grootte, hash FROM bestanden WHERE pad = ? AND profiel = ?",
+                (pad, profiel),
+            ).fetchone()
+            if rij and rij[0] == stat.st_mtime_ns and rij[1] == stat.st_size:
+                hashes[pad] = rij[2]
+                continue
+
+            with open(pad, "rb") as f:
+                bestand_hash = hashlib.sha256(f.read()).hexdigest()
+            hashes[pad] = bestand_hash
+
+            if bestand_hash not in te_verwerken and not self._is_verwerkt(bestand_hash, profiel):
+                te_verwerken[bestand_hash] = pad
+            gewijzigd.append((pad, profiel, stat.st_mtime_ns, stat.st_size, bestand_hash))
+
+        # Alleen de paden gaan naar de extractie; elk formulier wordt pas gelezen als het
+        # aan de beurt is, dus er staat nooit een hele map in het geheugen
+        resultaten = []
+        if te_verwerken:
+            resultaten = list(stroom_formulieren(te_verwerken.values(), categorieen, kopvelden, workers, pool=pool))
+
+        # Observaties en bestandsgegevens in één transactie
+        with self.conn:
+            velden_per_hash = {}
+            for bestand_hash, (velden, treffers) in zip(te_verwerken, resultaten):
+                self._opslaan(bestand_hash, profiel, onderdeel, velden, treffers)
+                velden_per_hash[bestand_hash] = velden
+            # Al eerder verwerkte inhoud: kopvelden van het bestand dat er al staat
+            rijen = []
+            for rij in gewijzigd:
+                bestand_hash = rij[-1]
+                if bestand_hash not in velden_per_hash:
+                    velden_per_hash[bestand_hash] = self._velden(bestand_hash, profiel)
+                velden = velden_per_hash[bestand_hash]
+                rijen.append(rij + (velden["datum"], velden["dienst"], velden["inzetgebied"]))
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO bestanden (pad, profiel, mtime_ns, grootte, hash, datum, dienst, inzetgebied) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rijen,
+            )
+
+        self._opruimen(paden, profiel, mappen)
+
+        return [self._observaties(hashes[pad], profiel) for pad in paden]
+
+    def hashes(self, paden, categorieen, kopvelden=KOPVELDEN):
+        # Inhoud-hash per pad, zoals bijwerken() die heeft vastgelegd
+        profiel = profiel_sleutel(categorieen, kopvelden)
+        rijen = []
+        for pad in paden:
+            rij = self.conn.execute(
+                "SELECT hash FROM bestanden WHERE pad = ? AND profiel = ?", (pad, profiel)
+            ).fetchone()
+            rijen.append(rij[0] if rij else None)
+        return rijen
+
+    def _opruimen(self, paden, profiel, mappen=None):
+        # Verdwenen bestanden uit de gescande map(pen) vergeten, en observaties van
+        # bestandsversies waar geen bestand meer naar verwijst
+        if mappen is None:
+            mappen = {os.path.dirname(pad) for pad in paden}
+        mappen = {os.path.normpath(map_) for map_ in mappen}
+        aanwezig = set(paden)
+        with self.conn:
+            for (pad,) in self.conn.execute("SELECT pad FROM bestanden WHERE profiel = ?", (profiel,)).fetchall():
+                if pad.startswith("upload:"):
+                    continue
+                if os.path.normpath(os.path.dirname(pad)) in mappen and pad not in aanwezig:
+                    self.conn.execute("DELETE FROM bestanden WHERE pad = ? AND profiel = ?", (pad, profiel))
+            self.conn.execute(
+                "DELETE FROM observaties WHERE profiel = ? AND hash NOT IN (SELECT hash FROM bestanden WHERE profiel = ?)",
+                (profiel, profiel),
+            )
+
+    def toevoegen(self, naam, bestand_hash, grootte, velden, treffers, categorieen, kopvelden=KOPVELDEN, onderdeel=None):
+        # Een upload (zonder pad op schijf) bewaren voor de zoekpagina. De rij staat op
+        # inhoud en naam: een latere upload met dezelfde naam vervangt hem niet, anders
+        # ruimt _opruimen de observaties van de eerste op
+        profiel = profiel_sleutel(categorieen, kopvelden)
+        with self.conn:
+            if not self._is_verwerkt(bestand_hash, profiel):
+                self._opslaan(bestand_hash, profiel, onderdeel, velden, treffers)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO bestanden (pad, profiel, mtime_ns, grootte, hash, datum, dienst, inzetgebied) "
+                "VALUES (?, ?, 0, ?, ?, ?, ?, ?)",
+                (f"upload:{bestand_hash}/{os.path.basename(naam)}", profiel, grootte, bestand_hash,
+                 velden["datum"], velden["dienst"], velden["inzetgebied"]),
+            )
+
+    # -------------------------------
+    # Geschreven overzichten
+    # -------------------------------
+    def overzicht_inhoud(self, pad, profiel, weergave, titel):
+        # De hashes van de formulieren in het overzicht op pad, of None als het er niet is,
+        # met een ander profiel, andere weergave of titel is gemaakt, of daarna is gewijzigd
+        rij = self.conn.execute(
+            "SELECT profiel, weergave, titel, mtime_ns, grootte FROM overzichten WHERE pad = ?", (pad,)
+        ).fetchone()
+        if rij is None or rij[:3] != (profiel, weergave, titel):
+            return None
+        try:
+            stat = os.stat(pad)
+        except FileNotFoundError:
+            return None
+        if (stat.st_mtime_ns, stat.st_size) != rij[3:]:
+            return None
+        return {h for (h,) in self.conn.execute("SELECT hash FROM overzicht_bestanden WHERE pad = ?", (pad,))}
+
+    def overzicht_opslaan(self, pad, profiel, weergave, titel, hashes):
+        # Na het schrijven van het overzicht op pad, met de formulieren (hashes) erin
+        stat = os.stat(pad)
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO overzichten (pad, profiel, weergave, titel, mtime_ns, grootte) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (pad, profiel, weergave, titel, stat.st_mtime_ns, stat.st_size),
+            )
+            self.conn.execute("DELETE FROM overzicht_bestanden WHERE pad = ?", (pad,))
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO overzicht_bestanden (pad, hash) VALUES (?, ?)",
+                [(pad, h) for h in set(hashes)],
+            )
+
+    # -------------------------------
+    # Zoeken
+    # -------------------------------
+    def waarden(self, kolom):
+        # Keuzelijsten voor de filters (onderdeel, categorie)
+        assert kolom in ("onderdeel", "categorie", "inzetgebied")
+        return [
+            waarde for (waarde,) in self.conn.execute(
+                f"SELECT DISTINCT {kolom} FROM observaties WHERE {kolom} IS NOT NULL ORDER BY {kolom}"
+            )
+        ]
+
+    def zoek(self, zoekterm="", onderdelen=None, categorieen=None, inzetgebied=None, van=None, tot=None, limiet=200):
+        voorwaarden = []
+        parameters = []
+
+        if _fts_zoekterm(zoekterm):
+            voorwaarden.append("o.id IN (SELECT rowid FROM observaties_fts WHERE observaties_fts MATCH ?)")
+            parameters.append(_fts_zoekterm(zoekterm))
+        if onderdelen:
+            voorwaarden.append("o.onderdeel IN (%s)" % ",".join("?" * len(onderdelen)))
+            parameters.extend(onderdelen)
+        if categorieen:
+            voorwaarden.append("o.categorie IN (%s)" % ",".join("?" * len(categorieen)))
+            parameters.extend(categorieen)
+        if inzetgebied:
+            voorwaarden.append("o.inzetgebied LIKE ?")
+            parameters.append(f"%{inzetgebied}%")
+        if van:
+            voorwaarden.append("o.datum_iso >= ?")
+            parameters.append(van.isoformat())
+        if tot:
+            voorwaarden.append("o.datum_iso <= ?")
+            parameters.append(tot.isoformat())
+
+        waar = ("WHERE " + " AND ".join(voorwaarden)) if voorwaarden else ""
+        # Hetzelfde formulier kan onder meerdere profielen geïndexeerd zijn
+        sql = f"""
+            SELECT o.datum, o.dienst, o.inzetgebied, o.onderdeel, o.categorie, o.tekst,
+                   (SELECT MIN(b.pad) FROM bestanden b WHERE b.hash = o.hash AND b.profiel = o.profiel) AS bron
+            FROM observaties o
+            {waar}
+            GROUP BY o.hash, o.categorie, o.tekst
+            ORDER BY o.datum_iso DESC, o.id
+            LIMIT ?
+        """
+        parameters.append(limiet)
+        kolommen = ("datum", "dienst", "inzetgebied", "onderdeel", "categorie", "tekst", "bron")
+        return [dict(zip(kolommen, rij)) for rij in self.conn.execute(sql, parameters)]
+
+    # -------------------------------
+    # Trends (tabel trends, bijgehouden door triggers)
+    # -------------------------------
+    def trend_waarden(self, kolom, profielen):
+        # Keuzelijsten voor de trendpagina, alleen uit de huidige profielen
+        assert kolom in TREND_KOLOMMEN or kolom == "iso_jaar"
+        waar, parameters = self._trend_profielen(profielen)
+        return [
+            waarde for (waarde,) in self.conn.execute(
+                f"SELECT DISTINCT {kolom} FROM trends WHERE {waar} ORDER BY {kolom}", parameters
+            )
+        ]
+
+    def _trend_profielen(self, profielen):
+        # profielen: {onderdeel: profielsleutel}. Na een wijziging in de categorieën staan
+        # er observaties van de oude profielversie naast de nieuwe; die tellen niet mee
+        if not profielen:
+            return "0", []
+        waar = " OR ".join("(onderdeel = ? AND profiel = ?)" for _ in profielen)
+        return f"({waar})", [waarde for paar in profielen.items() for waarde in paar]
+
+    def trends(self, profielen, per=(), categorieen=None, inzetgebieden=None, dagdelen=None, jaren=None):
+        # Aantal observaties per ISO-week, opgesplitst naar de kolommen in `per`; zonder
+        # datum (iso_jaar 0) telt niet mee, dubbele observaties één keer (versie 5).
+        # [{"jaar", "week", <per>..., "aantal"}]
+        assert all(kolom in TREND_KOLOMMEN for kolom in per)
+        waar, parameters = self._trend_profielen(profielen)
+        voorwaarden = [waar, "iso_jaar > 0"]
+        for kolom, waarden in (("categorie", categorieen), ("inzetgebied", inzetgebieden),
+                               ("dagdeel", dagdelen), ("iso_jaar", jaren)):
+            if waarden:
+                voorwaarden.append(f"{kolom} IN (%s)" % ",".join("?" * len(waarden)))
+                parameters.extend(waarden)
+
+        groep = ", ".join(("iso_jaar", "iso_week") + tuple(per))
+        sql = f"""
+            SELECT {groep}, SUM(aantal)
+            FROM trends
+            WHERE {" AND ".join(voorwaarden)}
+            GROUP BY {groep}
+            ORDER BY {groep}
+        """
+        kolommen = ("jaar", "week") + tuple(per) + ("aantal",)
+        return [dict(zip(kolommen, rij)) for rij in self.conn.execute(sql, parameters)]
@@ -0,0 +1,325 @@
+import hashlib
+import heapq
+from collections import defaultdict
+from datetime import date
+from itertools import repeat
+from operator import attrgetter
+
+from datums import dienst_index, parse_datum
+from docx_extractie import extraheer_formulieren, stroom_formulieren
+from rapport import BestaandRapport, maak_rapport
+
+# -------------------------------
+# Eén verwerking voor alle scripts, gestuurd door een profiel (profielen.py)
+# -------------------------------
+DAGEN = ["Maandag", "Dinsdag", "Woensdag", "Donderdag", "Vrijdag", "Zaterdag", "Zondag"]
+
+def extraheer(profiel, bronnen, workers=None, tijden=None, week=None):
+    # Formulieren parallel verwerken (DEBRIEFINGS_WORKERS), in de volgorde van bronnen.
+    # Met week = (jaar, weeknummer) krijgen formulieren buiten die week treffers None
+    return extraheer_formulieren(bronnen, profiel.categorieen, profiel.kopvelden, workers, tijden, week)
+
+
+def extraheer_stroom(profiel, bronnen, workers=None, tijden=None, week=None):
+    # Zelfde, maar bronnen wordt pas gelezen als er plek is in de pool (generator)
+    return stroom_formulieren(bronnen, profiel.categorieen, profiel.kopvelden, workers, tijden, week=week)
+
+
+# -------------------------------
+# Observaties met vooraf berekende sorteersleutels
+# -------------------------------
+class Observatie:
+    # Eén antwoord uit een formulier. dag, dienst_index en sleutel worden één keer
+    # per formulier berekend; sorteren en groeperen gebruikt alleen die
+    __slots__ = ("datum", "dienst", "inzetgebied", "categorie", "tekst", "bestand", "dag", "dienst_index", "sleutel")
+
+    def __init__(self, datum, dienst, inzetgebied, categorie, tekst, dag=None, index=None, bestand=None):
+        self.datum = datum
+        self.dienst = dienst
+        self.inzetgebied = inzetgebied
+        self.categorie = categorie
+        self.tekst = tekst
+        self.bestand = bestand
+        self.dag = dag if dag is not None else parse_datum(datum)
+        self.dienst_index = index if index is not None else dienst_index(dienst)
+        self.sleutel = (self.dag or date.min, self.dienst_index)
+
+    def __repr__(self):
+        return f"Observatie({self.datum!r}, {self.dienst!r}, {self.inzetgebied!r}, {self.categorie!r}, {self.tekst!r})"
+
+
+def _vergelijkbaar(tekst):
+    # Voor het ontdubbelen: hoofdletters en witruimte tellen niet
+    return " ".join(tekst.split()).casefold() if tekst else ""
+
+
+def dienst_sleutel(datum, dienst, inzetgebied, dag=None, index=None):
+    # Zelfde dag, dagdeel en gebied, ook als datum of dienst anders gespeld is
+    dag = dag if dag is not None else parse_datum(datum)
+    index = index if index is not None else dienst_index(dienst)
+    return repr((dag or _vergelijkbaar(datum), index if index != 99 else _vergelijkbaar(dienst), _vergelijkbaar(inzetgebied)))
+
+
+def dubbel_sleutel(dienst_sleutel, categorie, tekst):
+    # Digest van vaste grootte: zelfde digest = dezelfde observatie (ook in de index)
+    sleutel = "\x1f".join((dienst_sleutel, categorie, _vergelijkbaar(tekst))).encode("utf-8")
+    return hashlib.blake2b(sleutel, digest_size=16).digest()
+
+
+def verzamel(profiel, per_bestand, namen=None, dubbelen=None):
+    # (velden, treffers) per formulier -> per categorie een lijst Observatie.
+    # namen: optioneel de bestandsnaam per formulier, voor de export (export.py)
+    # Dezelfde observatie (datum, dienst, inzetgebied, categorie en tekst) uit meerdere
+    # formulieren, bijv. een Debriefingsformulier en een Dagrapport van dezelfde dienst,
+    # komt er één keer in; de weggelaten observaties gaan naar de lijst dubbelen als die
+    # er is. Inzetgebied telt mee, anders verdwijnt "Geen bijzonderheden" van het ene
+    # gebied omdat een ander gebied in dezelfde dienst hetzelfde schreef. Van elke
+    # observatie wordt alleen een digest van vaste grootte onthouden, geen kopie van de tekst
+    resultaten = {cat: [] for cat in profiel.categorieen}
+    gezien = set()
+    for (velden, treffers), naam in zip(per_bestand, namen if namen is not None else repeat(None)):
+        if not treffers:
+            continue
+        velden = profiel.normaliseer(velden)
+        datum, dienst, inzetgebied = velden["datum"], velden["dienst"], velden["inzetgebied"]
+        dag, index = parse_datum(datum), dienst_index(dienst)
+        kop = dienst_sleutel(datum, dienst, inzetgebied, dag, index)
+        for cat, tekst in treffers:
+            obs = Observatie(datum, dienst, inzetgebied, cat, tekst, dag, index, naam)
+            sleutel = dubbel_sleutel(kop, cat, tekst)
+            if sleutel in gezien:
+                if dubbelen is not None:
+                    dubbelen.append(obs)
+                continue
+            gezien.add(sleutel)
+            resultaten[cat].append(obs)
+    return resultaten
+
+
+# -------------------------------
+# Eén gedeelde tabel voor alle weergaven
+# -------------------------------
+# Kolommen waarop een weergave kan groeperen
+CEL = ("datum", "categorie", "inzetgebied")
+
+
+class ObservatieTabel:
+    # Alle observaties één keer gesorteerd (datum, dienst) en één keer gegroepeerd per
+    # cel (datum, categorie, inzetgebied). Elke weergave haalt er met pivot() zijn eigen
+    # groepering uit door cellen samen te voegen; de observaties zelf worden daarvoor
+    # niet opnieuw doorlopen
+
+    def __init__(self, profiel, resultaten):
+        self.profiel = profiel
+        self._invoer = [obs for items in resultaten.values() for obs in items]
+        self._positie = {id(obs): i for i, obs in enumerate(self._invoer)}
+        self.rijen = sorted(self._invoer, key=attrgetter("sleutel"))
+
+        # Per cel: de plaatsen in rijen (oplopend, dus op datum en dienst) en de eerste
+        # binnenkomst
+        self._cellen = defaultdict(list)
+        self._eerste_cel = {}
+        for plaats, obs in enumerate(self.rijen):
+            cel = (obs.datum, obs.categorie, obs.inzetgebied)
+            self._cellen[cel].append(plaats)
+            positie = self._positie[id(obs)]
+            if positie < self._eerste_cel.get(cel, len(self._invoer)):
+                self._eerste_cel[cel] = positie
+
+        # Volgorde van de waarden per kolom: datums chronologisch, categorieën zoals in
+        # het profiel, inzetgebieden op naam. Gelijke waarden in volgorde van binnenkomst
+        dagen = {obs.datum: obs.sleutel[0] for obs in self._invoer}
+        categorieen = {cat: i for i, cat in enumerate(profiel.categorieen)}
+        self._volgorde = {
+            "datum": dagen.__getitem__,
+            "categorie": categorieen.__getitem__,
+            "inzetgebied": lambda inzetgebied: inzetgebied or "",
+        }
+        self._pivots = {}
+
+    def pivot(self, *kolommen):
+        # Geneste dicts {waarde: {waarde: [Observatie, ...]}} in de volgorde van kolommen;
+        # de lijsten onderaan zijn op (datum, dienst) gesorteerd
+        if kolommen not in self._pivots:
+            self._pivots[kolommen] = self._maak_pivot(kolommen)
+        return self._pivots[kolommen]
+
+    def _maak_pivot(self, kolommen):
+        plek = [CEL.index(kolom) for kolom in kolommen]
+
+        # Cellen per groep, en per niveau de eerste binnenkomst van dat deel van de sleutel
+        groepen = defaultdict(list)
+        eerste = {}
+        for cel, plaatsen in self._cellen.items():
+            waarden = tuple(cel[i] for i in plek)
+            groepen[waarden].append(plaatsen)
+            for diepte in range(1, len(kolommen) + 1):
+                deel = waarden[:diepte]
+                if self._eerste_cel[cel] < eerste.get(deel, len(self._invoer)):
+                    eerste[deel] = self._eerste_cel[cel]
+
+        volgorde = [self._volgorde[kolom] for kolom in kolommen]
+
+        def sorteersleutel(s):
+            return tuple((f(w), eerste[s[:d + 1]]) for d, (f, w) in enumerate(zip(volgorde, s)))
+
+        boom = {}
+        for sleutel in sorted(groepen, key=sorteersleutel):
+            knoop = boom
+            for waarde in sleutel[:-1]:
+                knoop = knoop.setdefault(waarde, {})
+            cellen = groepen[sleutel]
+            plaatsen = cellen[0] if len(cellen) == 1 else heapq.merge(*cellen)
+            knoop[sleutel[-1]] = [self.rijen[plaats] for plaats in plaatsen]
+        return boom
+
+    def eerste(self, observaties):
+        # De observatie die als eerste binnenkwam (bijv. voor de dienst in een kop)
+        return min(observaties, key=lambda obs: self._positie[id(obs)])
+
+
+def _opsomming(rapport, tekst):
+    for regel in tekst.split('\n'):
+        regel = regel.strip()
+        if regel:
+            rapport.opsomming(regel)
+
+
+# -------------------------------
+# Weergaven (groeperingsvolgorde van het overzicht)
+# -------------------------------
+def per_categorie(rapport, tabel, dagnaam=True):
+    # Categorie -> Datum (dienst)
+    for cat, observaties in tabel.pivot("categorie").items():
+        rapport.kop(cat.upper(), 1)
+        for obs in observaties:
+            if dagnaam:
+                dag_nl = DAGEN[obs.dag.weekday()] if obs.dag else ""
+                if dag_nl and dag_nl.lower() in obs.datum.lower():
+                    dag_nl = ""
+                rapport.kop(f"{dag_nl} {obs.datum} ({obs.dienst})", 3)
+            else:
+                rapport.kop(f"{obs.datum} ({obs.dienst})", 3)
+            _opsomming(rapport, obs.tekst)
+
+
+def per_datum_inzetgebied(rapport, tabel):
+    # Datum -> Inzetgebied (dienst) -> Categorie
+    for datum, inzetgebieden in tabel.pivot("datum", "inzetgebied", "categorie").items():
+        rapport.kop(f"📅 {datum}", 1)
+
+        for inzetgebied, categoriedata in inzetgebieden.items():
+            if not inzetgebied:
+                continue
+
+            # Dienst van de eerste observatie in de eerste categorie
+            dienst_naam = tabel.eerste(next(iter(categoriedata.values()))).dienst
+            kop_tekst = f"📍 {inzetgebied}"
+            if dienst_naam:
+                kop_tekst += f" ({dienst_naam})"
+            rapport.kop(kop_tekst, 2)
+
+            for cat, observaties in categoriedata.items():
+                rapport.kop(cat.upper(), 3, rood=True)
+                for obs in observaties:
+                    _opsomming(rapport, obs.tekst)
+
+
+def per_datum_categorie(rapport, tabel):
+    # Datum -> Categorie -> Inzetgebied (dienst)
+    for datum, categoriedata in tabel.pivot("datum", "categorie", "inzetgebied").items():
+        rapport.kop(f"📅 {datum}", 1)
+
+        for cat, inzetgebieden in categoriedata.items():
+            rapport.kop(cat.upper(), 2, rood=True)
+
+            for inzetgebied, observaties in inzetgebieden.items():
+                dienst_naam = tabel.eerste(observaties).dienst
+                inzet_kop = f"📍 {inzetgebied}"
+                if dienst_naam:
+                    inzet_kop += f" ({dienst_naam})"
+                rapport.kop(inzet_kop, 3)
+
+                for obs in observaties:
+                    _opsomming(rapport, obs.tekst)
+
+
+def per_categorie_inzetgebied(rapport, tabel):
+    # Categorie -> Inzetgebied -> Dienst
+    for cat, inzetgebieden in tabel.pivot("categorie", "inzetgebied").items():
+        rapport.kop(cat.upper(), 1, rood=True)
+
+        for inzetgebied, observaties in inzetgebieden.items():
+            rapport.kop(f"{inzetgebied}", 2)
+            for obs in observaties:
+                rapport.alinea(obs.dienst, vet=True, ruimte_na=0)
+                _opsomming(rapport, obs.tekst)
+
+
+WEERGAVEN = {
+    "per_categorie": per_categorie,
+    "per_datum_inzetgebied": per_datum_inzetgebied,
+    "per_datum_categorie": per_datum_categorie,
+    "per_categorie_inzetgebied": per_categorie_inzetgebied,
+}
+
+
+def _schrijf(tabel, weergave, titel, schrijver, opties):
+    rapport = maak_rapport(schrijver)
+    rapport.titel(titel)
+    WEERGAVEN[weergave](rapport, tabel, **opties)
+    return rapport
+
+
+def maak_overzicht(profiel, weergave, resultaten, titel, schrijver="docx", **opties):
+    return _schrijf(ObservatieTabel(profiel, resultaten), weergave, titel, schrijver, opties)
+
+
+# -------------------------------
+# Een bestaand overzicht aanvullen
+# -------------------------------
+# Alleen per_categorie: daar heeft elke observatie een eigen kop (datum en dienst) die
+# op zijn plek tussen de bestaande komt. In de andere weergaven staan meerdere
+# observaties onder één kop en hangt de dienst in de kop af van de eerste; aanvullen
+# zou daar iets anders geven dan opnieuw maken, dus die worden opnieuw gemaakt.
+# Per kopniveau: koptekst -> (identiteit, volgorde), zoals per_categorie de koppen
+# schrijft en pivot() ze sorteert (zie BestaandRapport.invoegen)
+def _kop_dienst(tekst):
+    # "[Zaterdag ]31-05-2025 (Ochtenddienst)": elke observatie een eigen kop
+    datum, _, dienst = tekst.partition(" (")
+    return None, (parse_datum(datum.strip()) or date.min, dienst_index(dienst))
+
+
+def _kop_volgorde(profiel, weergave):
+    if weergave != "per_categorie":
+        raise ValueError(f"Weergave {weergave} kan niet aangevuld worden, alleen opnieuw gemaakt")
+    categorieen = {cat.upper(): i for i, cat in enumerate(profiel.categorieen)}
+
+    def categorie(tekst):
+        return tekst, categorieen.get(tekst, len(categorieen))
+
+    return {1: categorie, 3: _kop_dienst}
+
+
+def vul_overzicht_aan(profiel, weergave, bestaand, resultaten, **opties):
+    # bestaand: de .docx-bytes van een overzicht met dezelfde weergave en opties;
+    # resultaten: alleen de observaties die er nog niet in staan. Alleen die worden
+    # geschreven en tussengevoegd, alsof ze als laatste binnenkwamen. ValueError voor een
+    # andere weergave dan per_categorie of een document dat hier niet vandaan komt
+    volgorde = _kop_volgorde(profiel, weergave)
+    rapport = BestaandRapport(bestaand)
+    WEERGAVEN[weergave](rapport, ObservatieTabel(profiel, resultaten), **opties)
+    rapport.invoegen(volgorde)
+    return rapport
+
+
+def maak_overzichten(profiel, weergaven, resultaten, schrijver="docx", **invulling):
+    # Alle weergaven uit één tabel, na elkaar geschreven (python-docx en het vullen van
+    # het sjabloon zijn Python-werk, threads maken het niet sneller); geeft de .docx-bytes
+    # per weergave in dezelfde volgorde. Titels mogen {week}, {jaar}, {onderdeel} bevatten
+    tabel = ObservatieTabel(profiel, resultaten)
+    return [
+        _schrijf(tabel, weergave["weergave"], weergave["titel"].format(**invulling), schrijver,
+                 weergave.get("opties", {})).naar_bytes()
+        for weergave in weergaven
+    ]
@@ -0,0 +1,82 @@
+import streamlit as st
+import time
+from datetime import date, timedelta
+from Login import Login
+from observatie_index import ObservatieIndex
+from profielen import PROFIELEN, compileer_profiel
+
+Login.require_login()
+
+# Zoveel lijnen in de grafiek; de rest wordt samen "overig"
+MAX_LIJNEN = 10
+
+
+def week_label(jaar, week):
+    return f"{jaar}-W{week:02d}"
+
+
+def alle_weken(eerste, laatste):
+    # Doorlopende ISO-weken, zodat weken zonder meldingen als 0 in de grafiek staan
+    dag = date.fromisocalendar(*eerste, 1)
+    eind = date.fromisocalendar(*laatste, 1)
+    weken = []
+    while dag <= eind:
+        weken.append(tuple(dag.isocalendar())[:2])
+        dag += timedelta(weeks=1)
+    return weken
+
+
+# -------------------------------
+# Trends per categorie, week en inzetgebied
+# -------------------------------
+st.title("📈 Trends in debriefings")
+st.caption("Aantal observaties per week, uit de index (Debriefingsformulieren/observaties.sqlite): weekmappen en "
+           "uploads, ook van de evenementen. Dezelfde observatie uit meerdere formulieren telt één keer, zoals in "
+           "de overzichten")
+
+index = ObservatieIndex()
+
+# Alleen de huidige versie van elk profiel telt mee
+profielen = {naam: compileer_profiel(naam).sleutel for naam in PROFIELEN}
+
+kolom1, kolom2 = st.columns(2)
+with kolom1:
+    onderdelen = st.multiselect("Onderdeel", index.trend_waarden("onderdeel", profielen))
+    gekozen = {naam: profielen[naam] for naam in onderdelen} or profielen
+    categorieen = st.multiselect("Categorie", index.trend_waarden("categorie", gekozen))
+    jaren = st.multiselect("Jaar", [jaar for jaar in index.trend_waarden("iso_jaar", gekozen) if jaar])
+with kolom2:
+    inzetgebieden = st.multiselect("Inzetgebied", index.trend_waarden("inzetgebied", gekozen))
+    dagdelen = st.multiselect("Dagdeel", index.trend_waarden("dagdeel", gekozen))
+    per = st.radio("Lijn per", ["categorie", "onderdeel", "inzetgebied", "dagdeel"], horizontal=True)
+
+start = time.perf_counter()
+rijen = index.trends(gekozen, (per,), categorieen, inzetgebieden, dagdelen, jaren)
+duur = time.perf_counter() - start
+index.close()
+
+if not rijen:
+    st.info("Geen observaties met een datum voor deze keuze")
+    st.stop()
+
+# Grootste groepen als eigen lijn
+totalen = {}
+for rij in rijen:
+    groep = rij[per] or "onbekend"
+    totalen[groep] = totalen.get(groep, 0) + rij["aantal"]
+lijnen = sorted(totalen, key=totalen.get, reverse=True)[:MAX_LIJNEN]
+if len(totalen) > MAX_LIJNEN:
+    lijnen.append("overig")
+
+weken = alle_weken((rijen[0]["jaar"], rijen[0]["week"]), max((rij["jaar"], rij["week"]) for rij in rijen))
+positie = {week: i for i, week in enumerate(weken)}
+reeksen = {lijn: [0] * len(weken) for lijn in lijnen}
+for rij in rijen:
+    groep = rij[per] or "onbekend"
+    lijn = groep if groep in reeksen else "overig"
+    reeksen[lijn][positie[(rij["jaar"], rij["week"])]] += rij["aantal"]
+
+st.caption(f"{sum(totalen.values())} observaties over {len(weken)} weken, opgehaald in {duur * 1000:.0f} ms")
+st.line_chart({"week": [week_label(*week) for week in weken], **reeksen}, x="week", y=lijnen)
+
+st.table([{per: groep, "aantal": totalen[groep]} for groep in sorted(totalen, key=totalen.get, reverse=True)])
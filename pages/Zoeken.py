@@ -0,0 +1,65 @@
+import streamlit as st
+import glob
+import os
+import time
+from Login import Login
+from docx_extractie import is_formulier, is_overzicht
+from observatie_index import ObservatieIndex
+from profielen import compileer_profiel
+
+Login.require_login()
+
+# -------------------------------
+# Zoeken in alle debriefings
+# -------------------------------
+st.title("🔎 Zoeken in debriefings")
+
+index = ObservatieIndex()
+
+# Weekmappen horen bij Nieuw-West, net als in debriefings.py
+profiel = compileer_profiel("Nieuw-West")
+
+with st.sidebar:
+    # Formulieren uit de weekmappen (opnieuw) in de index opnemen
+    if st.button("Weekmappen indexeren"):
+        with st.spinner("Weekmappen worden geïndexeerd..."):
+            for weekmap in sorted(glob.glob(os.path.join("Debriefingsformulieren", "Week*"))):
+                # Zonder Word-lockbestanden (~$...) en de overzichten zelf, zoals debriefings.py.
+                # Ook een lege map, dan worden de verwijderde formulieren vergeten
+                paden = [
+                    pad for pad in glob.glob(os.path.join(weekmap, "*.docx"))
+                    if is_formulier(pad) and not is_overzicht(pad)
+                ]
+                index.bijwerken(paden, profiel.categorieen, profiel.kopvelden, onderdeel=profiel.naam, mappen=[weekmap])
+        st.success("✅ Index bijgewerkt")
+
+zoekterm = st.text_input("Zoekterm (bijv. een straat, locatie of incident)")
+
+kolom1, kolom2 = st.columns(2)
+with kolom1:
+    onderdelen = st.multiselect("Onderdeel", index.waarden("onderdeel"))
+    categorieen = st.multiselect("Categorie", index.waarden("categorie"))
+with kolom2:
+    inzetgebied = st.text_input("Inzetgebied bevat")
+    periode = st.date_input("Periode", value=[])
+
+van = periode[0] if len(periode) > 0 else None
+tot = periode[1] if len(periode) > 1 else van
+
+start = time.perf_counter()
+resultaten = index.zoek(zoekterm, onderdelen, categorieen, inzetgebied, van, tot)
+duur = time.perf_counter() - start
+index.close()
+
+st.caption(f"{len(resultaten)} observaties gevonden in {duur * 1000:.0f} ms")
+
+for r in resultaten:
+    kop = f"{r['datum'] or '?'} ({r['dienst'] or '?'})"
+    if r["inzetgebied"]:
+        kop += f" - {r['inzetgebied']}"
+    with st.expander(f"{kop} · {r['categorie']}"):
+        st.caption(f"{r['onderdeel'] or ''} · {os.path.basename(r['bron'] or '')}")
+        for regel in r["tekst"].split("\n"):
+            regel = regel.strip()
+            if regel:
+                st.markdown(f"- {regel}")
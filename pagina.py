@@ -0,0 +1,294 @@
+from functools import partial
+
+import streamlit as st
+from meting import TRAAG_FACTOR, Meting, log_pad
+from docx_extractie import zip_aantal, zip_formulieren
+from export import FORMATEN, beschikbare_formaten, export_rijen, exporteer
+from observatie_index import ObservatieIndex
+from overzicht import extraheer_stroom, verzamel, maak_overzichten
+from profielen import compileer_profiel
+from resultaat_cache import inhoud_hash
+from taken import Taak
+
+# -------------------------------
+# Gedeelde Streamlit-onderdelen voor de verwerkerpagina's
+# -------------------------------
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+def upload_formulieren():
+    return st.file_uploader(
+        "Upload één of meerdere .docx-bestanden, of een .zip van een weekmap",
+        type=["docx", "zip"],
+        accept_multiple_files=True
+    )
+
+
+def upload_sleutel(uploaded_files):
+    # Zelfde bestanden in dezelfde volgorde = zelfde invoer, zonder de inhoud te lezen
+    return tuple((f.name, f.size, getattr(f, "file_id", None)) for f in uploaded_files)
+
+
+def upload_hashes(uploaded_files):
+    # Wat er geüpload is, op inhoud: zelfde hashes = zelfde formulieren, ook vanuit een
+    # andere sessie of na een herstart (sleutel voor de gedeelde cache)
+    return tuple((f.name, inhoud_hash(f.getbuffer())) for f in uploaded_files)
+
+
+def aantal_formulieren(uploaded_files):
+    return sum(zip_aantal(f) if f.name.lower().endswith(".zip") else 1 for f in uploaded_files)
+
+
+def geuploade_formulieren(uploaded_files, meting):
+    # (naam, bytes) per formulier, één tegelijk en pas als de extractie erom vraagt;
+    # uit een zip alleen de .docx-leden. Er wordt niets van de upload gekopieerd of
+    # vastgehouden, dus het geheugen hangt niet af van het aantal formulieren
+    for uploaded_file in uploaded_files:
+        if uploaded_file.name.lower().endswith(".zip"):
+            leden = zip_formulieren(uploaded_file)
+        else:
+            leden = iter([(uploaded_file.name, uploaded_file.getvalue())])
+        while True:
+            with meting.stap("lezen"):
+                lid = next(leden, None)
+            if lid is None:
+                break
+            yield lid
+
+
+def maak_documenten(profiel, resultaten, rapport_schrijver, meting, **invulling):
+    # Elke weergave uit het profiel als eigen download: [(weergave, bestandsnaam, bytes)].
+    # Alle weergaven komen uit één gedeelde tabel en worden tegelijk geschreven
+    with meting.stap("rapport"):
+        documenten = maak_overzichten(profiel, profiel.weergaven, resultaten, rapport_schrijver, **invulling)
+    return [
+        (weergave, weergave["bestand"].format(**invulling), data)
+        for weergave, data in zip(profiel.weergaven, documenten)
+    ]
+
+
+def toon_dubbelen(dubbele_bestanden, dubbele_observaties):
+    # dubbele_bestanden: namen van uploads met dezelfde inhoud als een eerdere upload
+    if not (dubbele_bestanden or dubbele_observaties):
+        return
+    delen = []
+    if dubbele_bestanden:
+        delen.append(f"{len(dubbele_bestanden)} dubbel geüploade bestanden niet opnieuw verwerkt")
+    if dubbele_observaties:
+        delen.append(f"{len(dubbele_observaties)} dubbele observaties weggelaten")
+    st.info(", ".join(delen))
+    with st.expander("Dubbelen"):
+        for naam in dubbele_bestanden:
+            st.markdown(f"- {naam} (zelfde inhoud als een eerdere upload)")
+        for obs in dubbele_observaties:
+            st.markdown(f"- {obs.datum} ({obs.dienst}), {obs.categorie}: {obs.tekst[:80]} ({obs.bestand})")
+
+
+def toon_downloads(documenten):
+    for weergave, bestandsnaam, data in documenten:
+        st.success(weergave["melding"])
+        st.download_button(
+            label=weergave["label"],
+            data=data,
+            file_name=bestandsnaam,
+            mime=DOCX_MIME
+        )
+
+
+def maak_exports(profiel, resultaten, meting, naam):
+    # De observaties als tabel, in elk beschikbaar formaat: [(formaat, bestandsnaam, bytes)]
+    with meting.stap("export"):
+        rijen = export_rijen(profiel, resultaten)
+        return [
+            (formaat, f"{naam}.{FORMATEN[formaat][0]}", exporteer(rijen, formaat))
+            for formaat in beschikbare_formaten()
+        ]
+
+
+def toon_exports(exports):
+    st.caption("Alle observaties als tabel: datum, dienst, inzetgebied, categorie, tekst en bestand")
+    for kolom, (formaat, bestandsnaam, data) in zip(st.columns(len(exports)), exports):
+        kolom.download_button(
+            label=f"📊 {formaat.upper()}",
+            data=data,
+            file_name=bestandsnaam,
+            mime=FORMATEN[formaat][1],
+            key=f"export_{formaat}"
+        )
+    if "parquet" not in beschikbare_formaten():
+        st.caption("Parquet ontbreekt: pyarrow is niet geïnstalleerd (pip install -r requirements.txt)")
+
+
+# -------------------------------
+# Verwerken op de achtergrond (taken.py)
+# -------------------------------
+def huidige_taak(pagina, sleutel):
+    # De taak van deze sessie voor deze pagina, als die voor dezelfde invoer is
+    taak = st.session_state.get("taken", {}).get(pagina)
+    if taak is not None and taak.sleutel == sleutel:
+        return taak
+    return None
+
+
+def start_taak(pagina, sleutel, functie):
+    # Nieuwe invoer: een nog lopende taak van deze pagina stopt bij zijn volgende bestand
+    taken = st.session_state.setdefault("taken", {})
+    if pagina in taken:
+        taken[pagina].afbreken()
+    taken[pagina] = Taak(sleutel, functie)
+    return taken[pagina]
+
+
+def toon_voortgang(pagina, taak):
+    # Voortgangsbalk zolang de taak loopt; alleen dat stuk van de pagina ververst. Als de
+    # taak klaar is draait de pagina opnieuw en staat het resultaat klaar. True = resultaat
+    if taak.bezig:
+        @st.fragment(run_every=0.5)
+        def voortgang():
+            if not taak.bezig:
+                st.rerun()
+            st.progress(taak.fractie(), text=taak.omschrijving())
+
+        voortgang()
+        return False
+
+    if taak.fout is not None:
+        # Bij de volgende rerun opnieuw proberen
+        st.session_state["taken"].pop(pagina, None)
+        st.error(f"Verwerken mislukt: {taak.fout}")
+        return False
+    return taak.resultaat is not None
+
+
+# -------------------------------
+# Tijdmeting in de sidebar
+# -------------------------------
+def start_meting(script):
+    # Per bestand meten als het paneel aan staat of als er naar een log geschreven wordt
+    tonen = st.sidebar.checkbox("⏱️ Tijdmeting tonen", key="tijdmeting")
+    return Meting(script, bestanden_meten=tonen or bool(log_pad()))
+
+
+def rond_meting_af(meting):
+    # Aan het eind van de taak: één logregel per run, ook als het resultaat vaker getoond wordt
+    meting.afronden()
+    meting.schrijf_log()
+
+
+def toon_meting(meting, aantal=5):
+    if not st.session_state.get("tijdmeting"):
+        return
+
+    totaal = meting.totaal()
+    with st.sidebar:
+        st.subheader("⏱️ Tijdmeting")
+        st.caption(f"Totaal {totaal:.2f} s, {len(meting.bestanden)} bestanden gemeten")
+        st.table([
+            {"stap": stap, "seconden": round(duur, 3), "%": round(100 * duur / totaal) if totaal else 0}
+            for stap, duur in meting.stappen.items()
+        ])
+
+        rijen = meting.per_bestand()
+        if not rijen:
+            return
+
+        # Opgeteld over alle bestanden (bij meerdere workers meer dan de extractietijd)
+        per_stap = {}
+        for _, _, _, tijden in rijen:
+            for stap, duur in tijden.items():
+                per_stap[stap] = per_stap.get(stap, 0) + duur
+        st.caption("Extractie per stap, opgeteld over de bestanden")
+        st.table([{"stap": stap, "seconden": round(duur, 3)} for stap, duur in per_stap.items()])
+
+        traag = meting.trage_bestanden()
+        trage_nummers = {i for i, _, _ in traag}
+        st.caption(f"Traagste {min(aantal, len(rijen))} bestanden")
+        st.table([
+            {"#": i + 1, "bestand": ("🐢 " if i in trage_nummers else "") + naam, "seconden": round(duur, 3)}
+            for i, naam, duur, _ in rijen[:aantal]
+        ])
+        for i, naam, duur in traag:
+            st.warning(f"{naam} (#{i + 1}): {duur:.2f} s, meer dan {TRAAG_FACTOR}× de mediaan")
+
+
+def verwerk_evenement(profiel, uploaded_files, rapport_schrijver, meting, taak):
+    # Draait als taak: extractie, verzamelen en de documenten, zonder Streamlit
+    taak.bijwerken("extractie", klaar=0, totaal=aantal_formulieren(uploaded_files))
+    namen = []
+    hashes = {}
+    dubbele_bestanden = []
+    dubbele_observaties = []
+
+    def bronnen():
+        # Een bestand dat twee keer is geüpload (ook binnen een zip) wordt één keer gelezen
+        for bestandsnaam, data in geuploade_formulieren(uploaded_files, meting):
+            bestand_hash = inhoud_hash(data)
+            if bestand_hash in hashes:
+                dubbele_bestanden.append(bestandsnaam)
+                taak.volgende()
+                continue
+            hashes[bestand_hash] = len(data)
+            namen.append(bestandsnaam)
+            yield data
+
+    tijden = meting.extractie_tijden()
+    per_bestand = []
+    with meting.stap("extractie"):
+        for uitkomst in extraheer_stroom(profiel, bronnen(), tijden=tijden):
+            per_bestand.append(uitkomst)
+            taak.volgende()
+    meting.voeg_bestanden_toe(namen, tijden)
+
+    if namen:
+        # Doorzoekbaar op de zoekpagina en mee in de trends, net als de weekuploads
+        taak.bijwerken("index")
+        with meting.stap("index"), ObservatieIndex() as index:
+            for naam, (bestand_hash, grootte), (velden, treffers) in zip(namen, hashes.items(), per_bestand):
+                index.toevoegen(naam, bestand_hash, grootte, velden, treffers, profiel.categorieen, profiel.kopvelden,
+                                onderdeel=profiel.naam)
+
+    documenten = []
+    exports = []
+    if namen:
+        taak.bijwerken("verzamelen")
+        with meting.stap("verzamelen"):
+            resultaten = verzamel(profiel, per_bestand, namen, dubbele_observaties)
+
+        taak.bijwerken("rapport")
+        documenten = maak_documenten(profiel, resultaten, rapport_schrijver, meting, onderdeel=profiel.naam)
+
+        taak.bijwerken("export")
+        exports = maak_exports(profiel, resultaten, meting, f"Observaties_{profiel.naam}")
+
+    rond_meting_af(meting)
+    return {"documenten": documenten, "exports": exports, "meting": meting,
+            "dubbele_bestanden": dubbele_bestanden, "dubbele_observaties": dubbele_observaties}
+
+
+def evenement_pagina(naam, rapport_schrijver):
+    # Volledige pagina voor een evenement: uploaden, verwerken, downloaden
+    profiel = compileer_profiel(naam)
+    meting = start_meting(naam)
+
+    st.title("📄 Debriefings Verwerker")
+
+    uploaded_files = upload_formulieren()
+    if not uploaded_files:
+        return
+
+    # Eén taak per sessie; zolang de upload gelijk blijft komt het resultaat uit de sessie
+    sleutel = (upload_sleutel(uploaded_files), profiel.sleutel, rapport_schrijver)
+    taak = huidige_taak(naam, sleutel) or start_taak(
+        naam, sleutel, partial(verwerk_evenement, profiel, uploaded_files, rapport_schrijver, meting)
+    )
+    if not toon_voortgang(naam, taak):
+        return
+
+    if not taak.resultaat["documenten"]:
+        st.warning("Geen .docx-formulieren gevonden in de upload")
+        return
+
+    toon_dubbelen(taak.resultaat["dubbele_bestanden"], taak.resultaat["dubbele_observaties"])
+    toon_downloads(taak.resultaat["documenten"])
+    toon_exports(taak.resultaat["exports"])
+    toon_meting(taak.resultaat["meting"])
@@ -0,0 +1,172 @@
+import hashlib
+import json
+from functools import lru_cache
+
+from categorie_matcher import compileer_matcher
+from docx_extractie import KOPVELDEN
+
+# -------------------------------
+# Profielen per onderdeel en evenement
+# -------------------------------
+# Per profiel:
+#   categorieen    vragen in het formulier, in de volgorde van het overzicht
+#   kopvelden      (label in de kop-tabel, veld)
+#   normalisaties  (veld, regel, waarde), bijv. elk inzetgebied met "S105" erin wordt "S105"
+#   weergaven      overzichten die gemaakt worden, met hun groepering (zie overzicht.py)
+KOPVELDEN_EVENEMENT = [("Datum dienst", "datum"), ("Soort dienst", "dienst"), ("Inzetgebied", "inzetgebied")]
+
+# Titels en bestandsnamen mogen {week}, {jaar} en {onderdeel} bevatten
+WEERGAVE_WEEK = {
+    "weergave": "per_categorie",
+    "titel": "Debriefingsoverzicht Week {week} - {jaar}",
+    "bestand": "Week_{week}_Debriefingsoverzicht_{onderdeel}.docx",
+    "label": "📥 Download samenvatting",
+    "melding": "✅ Debriefing is gegenereerd!",
+}
+
+PROFIELEN = {
+    "Nieuw-West": {
+        "categorieen": ["OVERLAST PERSONEN", "JEUGDOVERLAST", "AFVALPROBLEMATIEK", "parkeeroverlast", "taken en opvallendheden"],
+        "kopvelden": KOPVELDEN,
+        "weergaven": [WEERGAVE_WEEK],
+    },
+    "VOV": {
+        "categorieen": ["Jeugdoverlast", "Slapers/daklozen", "Geen/ongeldig vervoersbewijs", "Fietsen/steps/skaten/scooter", "Nooddeuren", "Roken", "Alcohol/drugs", "Diefstal", "Overig", "Werkopdracht 1", "Werkopdracht 2", "Werkopdracht 3", "Werkopdracht 4"],
+        "kopvelden": KOPVELDEN,
+        "weergaven": [WEERGAVE_WEEK],
+    },
+    "SAIL": {
+        "categorieen": [
+            "Vrijhouden van calamiteitenroutes en vaarroutes",
+            "Toezien op in- en uitstroom van het evenement",
+            "Illegale evenementen in de openbare ruimte",
+            "In hoeverre vielen andere vormen van overlast op?",
+            "Sfeerbeeld op straat",
+            "Beschrijf hoe het publiek reageerde op de aanwezigheid van en contacten met THOR:",
+            "Was er sprake van agressie en geweld (fysiek en/of verbaal) tegen collega's van THOR?"
+        ],
+        "kopvelden": KOPVELDEN_EVENEMENT,
+        "weergaven": [
+            {
+                "weergave": "per_datum_inzetgebied",
+                "titel": "Debriefingsoverzicht SAIL 2025",
+                "bestand": "Debriefingsoverzicht.docx",
+                "label": "📥 Download samenvatting",
+                "melding": "✅ Debriefing is gegenereerd!",
+            },
+            {
+                "weergave": "per_datum_categorie",
+                "titel": "Debriefingsoverzicht SAIL 2025 (per categorie)",
+                "bestand": "Debriefingsoverzicht_per_categorie.docx",
+                "label": "📥 Download overzicht per categorie",
+                "melding": "✅ Alternatief overzicht (per categorie) is gegenereerd!",
+            },
+        ],
+    },
+    "Pride": {
+        "categorieen": [
+            "Vrijhouden van calamiteitenroutes en vaarwegen, inclusief bruggen en brughoofden",
+            "Toezien op (geluids-)overlast in openbare ruimte bij pleinen en straatfeesten tijdens de botenparade op het water en wal",
+            "Illegale evenementen in de openbare ruimte",
+            "Sfeerbeeld op straat",
+            "Beschrijf hoe het publiek reageerde op de aanwezigheid van en contacten met THOR",
+            "Was er sprake van agressie en geweld (fysiek en//of verbaal) tegen collega's van THOR?",
+            "Vragen omtrent bezetting en inzet"
+        ],
+        "kopvelden": KOPVELDEN_EVENEMENT,
+        "weergaven": [
+            {
+                "weergave": "per_datum_inzetgebied",
+                "titel": "Debriefingsoverzicht Pride 2025",
+                "bestand": "Debriefingsoverzicht.docx",
+                "label": "📥 Download samenvatting",
+                "melding": "✅ Debriefing is gegenereerd!",
+            },
+            {
+                "weergave": "per_datum_categorie",
+                "titel": "Debriefingsoverzicht Pride 2025 (per categorie)",
+                "bestand": "Debriefingsoverzicht_per_categorie.docx",
+                "label": "📥 Download overzicht per categorie",
+                "melding": "✅ Alternatief overzicht (per categorie) is gegenereerd!",
+            },
+        ],
+    },
+    "FestivalOpRing": {
+        "categorieen": [
+            "Vrijhouden van calamiteitenroutes",
+            "In- en uitstroom van publiek",
+            "Illegale evenementen in de openbare ruimte",
+            "In hoeverre vielen andere vormen van overlast op",
+            "Sfeerbeeld op straat",
+            "Beschrijf hoe het publiek reageerde op de aanwezigheid van en contacten met THOR:",
+            "Was er sprake van agressie en geweld (fysiek en//of verbaal) tegen collega's van THOR?",
+            "Had je voldoende capaciteit om in te zetten?"
+        ],
+        "kopvelden": KOPVELDEN_EVENEMENT,
+        "normalisaties": [("inzetgebied", "bevat", "S105")],
+        "weergaven": [
+            {
+                "weergave": "per_categorie_inzetgebied",
+                "titel": "Debriefingsoverzicht Feest op de Ring",
+                "bestand": "Debriefingsoverzicht.docx",
+                "label": "📥 Download samenvatting",
+                "melding": "✅ Debriefing is gegenereerd!",
+            },
+        ],
+    },
+}
+
+
+# -------------------------------
+# Normalisatieregels
+# -------------------------------
+def _bevat(waarde):
+    # Elke waarde waar dit in voorkomt (hoofdletterongevoelig) wordt precies deze waarde
+    zoek = waarde.upper()
+    return lambda tekst: waarde if zoek in tekst.upper() else tekst
+
+
+REGELS = {
+    "bevat": _bevat,
+}
+
+
+def profiel_sleutel(categorieen, kopvelden=KOPVELDEN):
+    # Andere categorieën of kopvelden geven een andere extractie, dus een ander profiel
+    inhoud = json.dumps([list(categorieen), [list(k) for k in kopvelden]], ensure_ascii=False)
+    return hashlib.sha256(inhoud.encode("utf-8")).hexdigest()[:16]
+
+
+class Profiel:
+    # Een gecompileerd profiel: matcher, kopvelden en normalisaties liggen vast
+
+    def __init__(self, naam, categorieen, kopvelden=KOPVELDEN, normalisaties=(), weergaven=()):
+        self.naam = naam
+        self.categorieen = list(categorieen)
+        self.kopvelden = [tuple(k) for k in kopvelden]
+        self.weergaven = [dict(w) for w in weergaven]
+        self.matcher = compileer_matcher(self.categorieen)
+        # Zelfde categorieën en kopvelden geven dezelfde extractie (index, caches)
+        self.sleutel = profiel_sleutel(self.categorieen, self.kopvelden)
+        # Het hele profiel, ook normalisaties en weergaven: zelfde versie geeft dezelfde
+        # overzichten (gedeelde cache in resultaat_cache.py)
+        inhoud = json.dumps([naam, self.categorieen, self.kopvelden, [list(n) for n in normalisaties], self.weergaven],
+                            ensure_ascii=False, sort_keys=True)
+        self.versie = hashlib.sha256(inhoud.encode("utf-8")).hexdigest()[:16]
+
+        self._normalisaties = [(veld, REGELS[regel](waarde)) for veld, regel, waarde in normalisaties]
+
+    def normaliseer(self, velden):
+        if not self._normalisaties:
+            return velden
+        velden = dict(velden)
+        for veld, functie in self._normalisaties:
+            if velden.get(veld) is not None:
+                velden[veld] = functie(velden[veld])
+        return velden
+
+
+@lru_cache(maxsize=None)
+def compileer_profiel(naam):
+    # Eén keer per proces per profiel
+    return Profiel(naam, **PROFIELEN[naam])
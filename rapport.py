@@ -0,0 +1,361 @@
+import os
+import re
+import tempfile
+import zipfile
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from io import BytesIO
+from xml.sax.saxutils import escape, unescape
+
+import docx
+from docx import Document
+from docx.shared import RGBColor
+from lxml import etree
+
+# -------------------------------
+# Rapporten in het geheugen opbouwen
+# -------------------------------
+# Tot deze grootte blijft een rapport volledig in het geheugen
+MAX_IN_GEHEUGEN = 32 * 1024 * 1024
+
+
+def document_bytes(doc):
+    # Grotere documenten lopen over naar een anoniem tijdelijk bestand; dat wordt
+    # bij het verlaten van het with-blok altijd verwijderd, ook bij een fout
+    with tempfile.SpooledTemporaryFile(max_size=MAX_IN_GEHEUGEN, suffix=".docx") as buffer:
+        doc.save(buffer)
+        buffer.seek(0)
+        return buffer.read()
+
+
+# -------------------------------
+# Schrijvers: python-docx of sjabloon
+# -------------------------------
+# Beide schrijvers hebben dezelfde methodes, zodat een script alleen bij
+# maak_rapport() kiest welke gebruikt wordt:
+#   titel(tekst)                          -> kop 0 ("Title")
+#   kop(tekst, niveau, rood=False)        -> "Heading n", rood = vet en rood
+#   alinea(tekst, vet=False, ruimte_na=None)
+#   opsomming(tekst)                      -> "List Bullet"
+#   naar_bytes()
+ROOD = RGBColor(255, 0, 0)
+ZWART = RGBColor(0, 0, 0)
+
+
+class DocxRapport:
+
+    def __init__(self):
+        self.doc = Document()
+
+    def titel(self, tekst):
+        self.doc.add_heading(tekst, 0)
+
+    def kop(self, tekst, niveau, rood=False):
+        if not rood:
+            self.doc.add_heading(tekst, niveau)
+            return
+        p = self.doc.add_paragraph()
+        run = p.add_run(tekst)
+        run.bold = True
+        run.font.color.rgb = ROOD
+        p.style = f'Heading {niveau}'
+
+    def alinea(self, tekst, vet=False, ruimte_na=None):
+        p = self.doc.add_paragraph(tekst)
+        if ruimte_na is not None:
+            p.paragraph_format.space_after = ruimte_na
+        if vet and p.runs:
+            run = p.runs[0]
+            run.bold = True
+            run.font.color.rgb = ZWART
+
+    def opsomming(self, tekst):
+        p = self.doc.add_paragraph(style='List Bullet')
+        p.add_run(tekst)
+
+    def naar_bytes(self):
+        return document_bytes(self.doc)
+
+
+STANDAARD_SJABLOON = os.path.join(os.path.dirname(docx.__file__), "templates", "default.docx")
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+# Tekens die niet in XML mogen (python-docx weigert ze ook)
+_ONGELDIG_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+@lru_cache(maxsize=8)
+def _stijl_ids(styles_xml):
+    # Alineastijlen: naam (kleine letters) -> stijl-id
+    stijl_ids = {}
+    for stijl in etree.fromstring(styles_xml).iter(f"{{{W_NS}}}style"):
+        naam = stijl.find(f"{{{W_NS}}}name")
+        if naam is not None and stijl.get(f"{{{W_NS}}}type") == "paragraph":
+            stijl_ids[naam.get(f"{{{W_NS}}}val").lower()] = stijl.get(f"{{{W_NS}}}styleId")
+    return stijl_ids
+
+
+@lru_cache(maxsize=8)
+def _lees_sjabloon(pad):
+    # Eén keer per proces: de onderdelen van het sjabloon, de stijl-id's en het
+    # document.xml rond de body
+    with zipfile.ZipFile(pad) as z:
+        onderdelen = [(info, z.read(info)) for info in z.infolist()]
+        stijl_ids = _stijl_ids(z.read("word/styles.xml"))
+        document_xml = z.read("word/document.xml").decode("utf-8")
+
+    # Alles tussen <w:body> en de sectie-eigenschappen wordt vervangen
+    body_start = document_xml.index(">", document_xml.index("<w:body")) + 1
+    sect = document_xml.find("<w:sectPr", body_start)
+    body_eind = sect if sect != -1 else document_xml.index("</w:body>")
+    return onderdelen, stijl_ids, document_xml[:body_start], document_xml[body_eind:]
+
+
+def _run_xml(tekst, rPr=""):
+    # Zelfde opbouw als add_run: \t wordt <w:tab/>, \n en \r worden <w:br/>
+    delen = []
+    for stuk in re.split(r"([\t\n\r])", _ONGELDIG_XML.sub("", tekst)):
+        if stuk == "\t":
+            delen.append("<w:tab/>")
+        elif stuk in ("\n", "\r"):
+            delen.append("<w:br/>")
+        elif stuk:
+            ruimte = ' xml:space="preserve"' if stuk != stuk.strip() else ""
+            delen.append(f"<w:t{ruimte}>{escape(stuk)}</w:t>")
+    return f"<w:r>{rPr}{''.join(delen)}</w:r>"
+
+
+class SjabloonRapport:
+    # Bouwt de body-XML als tekst op en vult daarmee in één keer een .docx-sjabloon
+
+    def __init__(self, sjabloon=STANDAARD_SJABLOON):
+        self.sjabloon = sjabloon
+        self._onderdelen, self._stijl_ids, self._voor, self._na = _lees_sjabloon(sjabloon)
+        self._body = []
+
+    def _pPr(self, stijl=None, ruimte_na=None):
+        delen = []
+        if stijl:
+            delen.append(f'<w:pStyle w:val="{self._stijl_ids.get(stijl.lower(), stijl.replace(" ", ""))}"/>')
+        if ruimte_na is not None:
+            delen.append(f'<w:spacing w:after="{int(ruimte_na) // 635}"/>')
+        return f"<w:pPr>{''.join(delen)}</w:pPr>" if delen else ""
+
+    def titel(self, tekst):
+        run = _run_xml(tekst) if tekst else ""
+        self._body.append(f"<w:p>{self._pPr('Title')}{run}</w:p>")
+
+    def kop(self, tekst, niveau, rood=False):
+        if rood:
+            run = _run_xml(tekst, '<w:rPr><w:b/><w:color w:val="FF0000"/></w:rPr>')
+        else:
+            run = _run_xml(tekst) if tekst else ""
+        self._body.append(f"<w:p>{self._pPr(f'Heading {niveau}')}{run}</w:p>")
+
+    def alinea(self, tekst, vet=False, ruimte_na=None):
+        rPr = '<w:rPr><w:b/><w:color w:val="000000"/></w:rPr>' if vet else ""
+        run = _run_xml(tekst, rPr) if tekst else ""
+        self._body.append(f"<w:p>{self._pPr(ruimte_na=ruimte_na)}{run}</w:p>")
+
+    def opsomming(self, tekst):
+        self._body.append(f"<w:p>{self._pPr('List Bullet')}{_run_xml(tekst)}</w:p>")
+
+    def naar_bytes(self):
+        document_xml = (self._voor + "".join(self._body) + self._na).encode("utf-8")
+        buffer = BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as z:
+            for info, inhoud in self._onderdelen:
+                if info.filename == "word/document.xml":
+                    inhoud = document_xml
+                z.writestr(info.filename, inhoud)
+        return buffer.getvalue()
+
+
+# -------------------------------
+# Een bestaand overzicht aanvullen
+# -------------------------------
+_KOP_RUN = re.compile(r"<w:t(?: [^>]*)?>([^<]*)</w:t>|<w:(br|tab)/>")
+
+
+def _kop_tekst(xml, begin):
+    # Tekst van de alinea die op begin start, zoals _run_xml hem schreef
+    eind = xml.index("</w:p>", begin)
+    delen = []
+    for m in _KOP_RUN.finditer(xml, begin, eind):
+        if m.group(2):
+            delen.append("\n" if m.group(2) == "br" else "\t")
+        else:
+            delen.append(unescape(m.group(1)))
+    return "".join(delen)
+
+
+class _Kop:
+    # Een kop met de diepere koppen eronder. plek: sorteersleutel van het begin van de
+    # kop (bestaand: (offset, 0), nieuw: de sleutel waaronder hij wordt ingevoegd);
+    # van nieuwe koppen staan de alinea's in xml: eerst de kop, dan wat eronder staat
+    __slots__ = ("niveau", "plek", "xml", "kinderen", "_tekst", "_sleutel")
+
+    def __init__(self, niveau, plek=None, xml=None, tekst=None):
+        self.niveau = niveau
+        self.plek = plek
+        self.xml = xml
+        self.kinderen = []
+        self._tekst = tekst
+        self._sleutel = None
+
+    def alle_xml(self):
+        yield from self.xml
+        for kind in self.kinderen:
+            yield from kind.alle_xml()
+
+    def sleutel(self, koppen, xml):
+        # (identiteit, volgorde) volgens koppen; pas uitgerekend als hij nodig is
+        if self._sleutel is None:
+            if self._tekst is None:
+                self._tekst = _kop_tekst(xml, self.plek[0])
+            self._sleutel = koppen.get(self.niveau, lambda tekst: (tekst, None))(self._tekst)
+        return self._sleutel
+
+
+class BestaandRapport(SjabloonRapport):
+    # Vult een overzicht aan dat eerder door SjabloonRapport is geschreven. De weergave
+    # schrijft alleen de nieuwe observaties, met dezelfde methodes als altijd; invoegen()
+    # zet die koppen en alinea's op hun plek tussen de bestaande. Het bestaande document
+    # wordt niet geparsed of opnieuw opgebouwd: de koppen worden in document.xml
+    # opgezocht en de nieuwe XML wordt ertussen gezet, de rest blijft byte voor byte gelijk
+
+    def __init__(self, data):
+        # ValueError voor alles wat niet als overzicht te lezen is; de aanroeper maakt
+        # het overzicht dan opnieuw
+        try:
+            with zipfile.ZipFile(BytesIO(data)) as z:
+                self._onderdelen = [(info, z.read(info)) for info in z.infolist()]
+                self._stijl_ids = _stijl_ids(z.read("word/styles.xml"))
+                self._xml = z.read("word/document.xml").decode("utf-8")
+        except (zipfile.BadZipFile, KeyError) as fout:
+            raise ValueError(f"Geen overzicht: {fout}") from fout
+        self._body = []
+
+        # Stijl-id -> kopniveau ("Heading 2" -> 2); de titel telt als gewone alinea
+        self._niveaus = {}
+        for naam, stijl_id in self._stijl_ids.items():
+            if naam.startswith("heading ") and naam[8:].isdigit():
+                self._niveaus[stijl_id] = int(naam[8:])
+        self._kop_patroon = re.compile(
+            '<w:p><w:pPr><w:pStyle w:val="(' + "|".join(map(re.escape, self._niveaus)) + ')"/>'
+        )
+
+        self._body_start = self._xml.index(">", self._xml.index("<w:body")) + 1
+        sect = self._xml.find("<w:sectPr", self._body_start)
+        self._body_eind = sect if sect != -1 else self._xml.index("</w:body>")
+        titel = f'<w:p>{self._pPr("Title")}'
+        if not self._xml.startswith(titel, self._body_start):
+            raise ValueError("Dit document is niet door SjabloonRapport geschreven")
+
+        self._invoegingen = []  # (sleutel, xml)
+        self._teller = 0
+
+    def _voor(self, plek):
+        # Sorteersleutel voor een invoeging direct vóór plek, achter wat daar al
+        # eerder is ingevoegd
+        self._teller += 1
+        return plek[:-1] + (plek[-1] - 1, self._teller)
+
+    def invoegen(self, koppen):
+        # koppen: per niveau een functie koptekst -> (identiteit, volgorde). Een nieuwe kop
+        # met dezelfde identiteit als een bestaande valt daarmee samen; anders komt hij
+        # vóór de eerste bestaande kop met een hogere volgorde, dus bij gelijke volgorde
+        # achter de bestaande (later binnengekomen). Identiteit None: altijd een eigen kop
+        bestaand = _Kop(0)
+        pad = [bestaand]
+        for m in self._kop_patroon.finditer(self._xml, self._body_start, self._body_eind):
+            kop = _Kop(self._niveaus[m.group(1)], (m.start(), 0))
+            while pad[-1].niveau >= kop.niveau:
+                pad.pop()
+            pad[-1].kinderen.append(kop)
+            pad.append(kop)
+
+        # De nieuwe alinea's: elke kop met alles eronder tot de volgende kop
+        nieuw = _Kop(0, xml=[])
+        pad = [nieuw]
+        for alinea in self._body:
+            m = self._kop_patroon.match(alinea)
+            if m is None:
+                pad[-1].xml.append(alinea)
+                continue
+            kop = _Kop(self._niveaus[m.group(1)], xml=[alinea], tekst=_kop_tekst(alinea, 0))
+            while pad[-1].niveau >= kop.niveau:
+                pad.pop()
+            pad[-1].kinderen.append(kop)
+            pad.append(kop)
+        self._body = []
+
+        self._samenvoegen(bestaand, nieuw, koppen, (self._body_eind, 0))
+
+    def _samenvoegen(self, doel, bron, koppen, einde):
+        # einde: plek direct na doel en alles eronder
+        inhoud = bron.xml[1:] if bron.niveau else bron.xml  # zonder de kop zelf
+        if inhoud:
+            # Achter de alinea's die al onder de kop stonden, vóór de eerste diepere kop
+            plek = doel.kinderen[0].plek if doel.kinderen else einde
+            self._invoegingen.append((self._voor(plek), "".join(inhoud)))
+
+        for kop in bron.kinderen:
+            identiteit, volgorde = kop.sleutel(koppen, None)
+            kinderen = [kind for kind in doel.kinderen if kind.niveau == kop.niveau]
+
+            # De bestaande koppen staan op volgorde: zoeken op volgorde, en alleen bij
+            # gelijke volgorde op identiteit
+            if volgorde is None:
+                begin, eind = 0, len(kinderen)
+            else:
+                begin = bisect_left(kinderen, volgorde, key=lambda kind: kind.sleutel(koppen, self._xml)[1])
+                eind = bisect_right(kinderen, volgorde, lo=begin, key=lambda kind: kind.sleutel(koppen, self._xml)[1])
+            gelijk = None
+            if identiteit is not None:
+                gelijk = next((kind for kind in kinderen[begin:eind] if kind.sleutel(koppen, self._xml)[0] == identiteit), None)
+
+            if gelijk is not None:
+                i = doel.kinderen.index(gelijk)
+                volgende = doel.kinderen[i + 1].plek if i + 1 < len(doel.kinderen) else einde
+                self._samenvoegen(gelijk, kop, koppen, volgende)
+                continue
+
+            # Nieuwe kop (met alles eronder) vóór de eerste kop met een hogere volgorde
+            if eind < len(kinderen):
+                i = doel.kinderen.index(kinderen[eind])
+                kop.plek = self._voor(kinderen[eind].plek)
+            else:
+                i = len(doel.kinderen)
+                kop.plek = self._voor(einde)
+            self._invoegingen.append((kop.plek, "".join(kop.alle_xml())))
+            doel.kinderen.insert(i, kop)
+
+    def naar_bytes(self):
+        delen = []
+        vorige = 0
+        for plek, xml in sorted(self._invoegingen, key=lambda invoeging: invoeging[0]):
+            delen.append(self._xml[vorige:plek[0]])
+            delen.append(xml)
+            vorige = plek[0]
+        delen.append(self._xml[vorige:])
+        document_xml = "".join(delen).encode("utf-8")
+
+        buffer = BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as z:
+            for info, inhoud in self._onderdelen:
+                if info.filename == "word/document.xml":
+                    inhoud = document_xml
+                z.writestr(info.filename, inhoud)
+        return buffer.getvalue()
+
+
+SCHRIJVERS = {
+    "docx": DocxRapport,
+    "sjabloon": SjabloonRapport,
+}
+
+
+def maak_rapport(schrijver="docx"):
+    return SCHRIJVERS[schrijver]()
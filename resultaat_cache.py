@@ -0,0 +1,129 @@
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+# -------------------------------
+# Extractieresultaten en overzichten, gedeeld over sessies en herstarts
+# -------------------------------
+# Eén SQLite-bestand naast de index. Alle sessies, Streamlit-processen en herstarts
+# gebruiken dezelfde cache: een tweede coördinator die dezelfde formulieren uploadt,
+# krijgt de extractie (per formulier) en het hele resultaat (overzichten en exports)
+# hieruit. Instellen met:
+#   DEBRIEFINGS_CACHE        pad van het bestand
+#   DEBRIEFINGS_CACHE_MB     ruimte voor de waarden (standaard 512); daarboven gaan de
+#                            langst niet gebruikte eruit (LRU)
+#   DEBRIEFINGS_CACHE_DAGEN  hoe lang een waarde bruikbaar is na het opslaan (standaard 14)
+STANDAARD_PAD = os.path.join("Debriefingsformulieren", "cache.sqlite")
+STANDAARD_MB = 512
+STANDAARD_DAGEN = 14
+
+# Ophogen als de extractie of de overzichten anders worden zonder dat het profiel
+# verandert; oude waarden worden dan niet meer gevonden en verlopen vanzelf
+CACHE_VERSIE = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    sleutel TEXT PRIMARY KEY,
+    waarde BLOB NOT NULL,
+    grootte INTEGER NOT NULL,
+    aangemaakt REAL NOT NULL,
+    gebruikt REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_cache_gebruikt ON cache (gebruikt);
+"""
+
+
+def inhoud_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _instelling(naam, standaard):
+    waarde = os.environ.get(naam)
+    return float(waarde) if waarde else standaard
+
+
+class SchijfCache:
+    # Zelfde get/put als een dict-cache. Sleutels zijn tuples van tekst en getallen
+    # (bijv. (inhoud-hash, profielversie)); waarden worden gepickled. Het bestand wordt
+    # alleen door deze app geschreven
+
+    def __init__(self, pad=None, max_bytes=None, ttl=None):
+        self.pad = pad or os.environ.get("DEBRIEFINGS_CACHE") or STANDAARD_PAD
+        self.max_bytes = max_bytes if max_bytes is not None else int(_instelling("DEBRIEFINGS_CACHE_MB", STANDAARD_MB) * 2**20)
+        self.ttl = ttl if ttl is not None else _instelling("DEBRIEFINGS_CACHE_DAGEN", STANDAARD_DAGEN) * 86400
+
+        # Eén verbinding voor alle threads van dit proces (Streamlit-sessies, taken);
+        # andere processen wachten op de SQLite-lock
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.pad, timeout=30, check_same_thread=False)
+        # Vóór de eerste tabel: verwijderde waarden geven hun ruimte in het bestand terug
+        self.conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            for statement in SCHEMA.split(";"):
+                if statement.strip():
+                    self.conn.execute(statement)
+
+    def close(self):
+        self.conn.close()
+
+    def get(self, sleutel):
+        nu = time.time()
+        with self._lock, self.conn:
+            rij = self.conn.execute(
+                "SELECT waarde, aangemaakt FROM cache WHERE sleutel = ?", (json.dumps(sleutel),)
+            ).fetchone()
+            if rij is None:
+                return None
+            if rij[1] < nu - self.ttl:
+                self.conn.execute("DELETE FROM cache WHERE sleutel = ?", (json.dumps(sleutel),))
+                return None
+            self.conn.execute("UPDATE cache SET gebruikt = ? WHERE sleutel = ?", (nu, json.dumps(sleutel)))
+        return pickle.loads(rij[0])
+
+    def put(self, sleutel, waarde):
+        data = pickle.dumps(waarde, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.max_bytes:
+            return
+        nu = time.time()
+        with self._lock:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO cache (sleutel, waarde, grootte, aangemaakt, gebruikt) VALUES (?, ?, ?, ?, ?)",
+                    (json.dumps(sleutel), data, len(data), nu, nu),
+                )
+                verwijderd = self._opruimen(nu)
+            if verwijderd:
+                self.conn.execute("PRAGMA incremental_vacuum")
+
+    def _opruimen(self, nu):
+        # Verlopen waarden eruit, en daarna de langst niet gebruikte tot alles in het
+        # budget past; geeft het aantal verwijderde waarden
+        verwijderd = self.conn.execute("DELETE FROM cache WHERE aangemaakt < ?", (nu - self.ttl,)).rowcount
+        totaal = self.conn.execute("SELECT COALESCE(SUM(grootte), 0) FROM cache").fetchone()[0]
+        if totaal <= self.max_bytes:
+            return verwijderd
+
+        weg = []
+        for sleutel, grootte in self.conn.execute("SELECT sleutel, grootte FROM cache ORDER BY gebruikt").fetchall():
+            if totaal <= self.max_bytes:
+                break
+            weg.append((sleutel,))
+            totaal -= grootte
+        self.conn.executemany("DELETE FROM cache WHERE sleutel = ?", weg)
+        return verwijderd + len(weg)
+
+    def grootte(self):
+        # Bytes aan waarden in de cache
+        with self._lock:
+            return self.conn.execute("SELECT COALESCE(SUM(grootte), 0) FROM cache").fetchone()[0]
+
+    def __len__(self):
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
@@ -0,0 +1,68 @@
+import threading
+
+# -------------------------------
+# Verwerking als achtergrondtaak (één per sessie en pagina)
+# -------------------------------
+# De taak draait in een eigen thread en roept zelf geen Streamlit aan; de pagina leest
+# alleen de voortgang en straks het resultaat. Zo blijft de pagina bruikbaar tijdens
+# het verwerken en komt het resultaat bij een volgende rerun direct uit de sessie.
+
+
+class TaakAfgebroken(Exception):
+    pass
+
+
+class Taak:
+
+    def __init__(self, sleutel, functie):
+        # sleutel: de invoer waarvoor de taak draait (uploads, profiel, instellingen);
+        # functie(taak) geeft het resultaat en meldt onderweg de voortgang
+        self.sleutel = sleutel
+        self.stap = "starten"
+        self.klaar = 0
+        self.totaal = None
+        self.resultaat = None
+        self.fout = None
+        self._afbreken = threading.Event()
+        self._thread = threading.Thread(target=self._draai, args=(functie,), daemon=True)
+        self._thread.start()
+
+    def _draai(self, functie):
+        try:
+            self.resultaat = functie(self)
+        except TaakAfgebroken:
+            pass
+        except Exception as e:
+            self.fout = e
+
+    @property
+    def bezig(self):
+        return self._thread.is_alive()
+
+    def bijwerken(self, stap=None, klaar=None, totaal=None):
+        # Aangeroepen vanuit de taak; stopt de taak als de invoer intussen is veranderd
+        if self._afbreken.is_set():
+            raise TaakAfgebroken()
+        if stap is not None:
+            self.stap = stap
+        if klaar is not None:
+            self.klaar = klaar
+        if totaal is not None:
+            self.totaal = totaal
+
+    def volgende(self):
+        # Eén bestand verder
+        self.bijwerken(klaar=self.klaar + 1)
+
+    def afbreken(self):
+        self._afbreken.set()
+
+    def fractie(self):
+        if not self.totaal:
+            return 0.0
+        return min(1.0, self.klaar / self.totaal)
+
+    def omschrijving(self):
+        if self.totaal is None:
+            return f"{self.stap}..."
+        return f"{self.stap}: {self.klaar} van {self.totaal} bestanden"
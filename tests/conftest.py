@@ -0,0 +1,15 @@
+import os
+import sys
+
+import pytest
+
+# De modules staan los in de map erboven (geen pakket)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from observatie_index import ObservatieIndex
+
+
+@pytest.fixture
+def index(tmp_path):
+    with ObservatieIndex(str(tmp_path / "observaties.sqlite")) as index:
+        yield index
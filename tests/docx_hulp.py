@@ -0,0 +1,78 @@
+import zipfile
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+# -------------------------------
+# Kleine .docx-bestanden in het geheugen, alleen wat de extractie leest
+# -------------------------------
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    "</Types>"
+)
+
+
+def alinea(tekst=""):
+    return f'<w:p><w:r><w:t xml:space="preserve">{escape(tekst)}</w:t></w:r></w:p>' if tekst else "<w:p/>"
+
+
+def cel(tekst="", span=1, v_merge=None):
+    eigenschappen = ""
+    if span > 1:
+        eigenschappen += f'<w:gridSpan w:val="{span}"/>'
+    if v_merge == "restart":
+        eigenschappen += '<w:vMerge w:val="restart"/>'
+    elif v_merge == "continue":
+        eigenschappen += "<w:vMerge/>"
+    alineas = "".join(alinea(regel) for regel in tekst.split("\n")) if tekst else alinea()
+    return f"<w:tc><w:tcPr>{eigenschappen}</w:tcPr>{alineas}</w:tc>"
+
+
+def rij(*cellen, grid_before=0):
+    eigenschappen = f'<w:trPr><w:gridBefore w:val="{grid_before}"/></w:trPr>' if grid_before else ""
+    return f"<w:tr>{eigenschappen}{''.join(cellen)}</w:tr>"
+
+
+def tabel(*rijen):
+    return f"<w:tbl><w:tblPr/>{''.join(rijen)}</w:tbl>"
+
+
+def datumkiezer(tekst):
+    return (
+        '<w:sdt><w:sdtPr><w:date w:fullDate="2025-05-31T00:00:00Z"/></w:sdtPr>'
+        f"<w:sdtContent>{alinea(tekst)}</w:sdtContent></w:sdt>"
+    )
+
+
+def document_xml(*body):
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f"<w:body>{''.join(body)}</w:body></w:document>"
+    )
+
+
+def docx(*body, xml=None):
+    # body: XML-stukken direct onder w:body; xml: het hele document.xml (ook kapot)
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w") as z:
+        z.writestr("[Content_Types].xml", CONTENT_TYPES)
+        z.writestr("word/document.xml", xml if xml is not None else document_xml(*body))
+    return buffer.getvalue()
+
+
+def formulier(datum, dienst, inzetgebied, antwoorden):
+    # Een debriefingsformulier zoals in de weekmappen: kop-tabel, dan per categorie de
+    # vraag over twee kolommen en het antwoord in de rij eronder
+    kop = tabel(
+        rij(cel("Datum dienst"), cel(datum)),
+        rij(cel("Soort dienst"), cel(dienst)),
+        rij(cel("Inzetgebied"), cel(inzetgebied)),
+    )
+    vragen = tabel(*(
+        rij(cel(vraag, span=2)) + rij(cel(antwoord, span=2)) for vraag, antwoord in antwoorden
+    ))
+    return docx(alinea("Debriefingsformulier"), kop, vragen)
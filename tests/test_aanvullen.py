@@ -0,0 +1,110 @@
+import zipfile
+from io import BytesIO
+
+import pytest
+from docx import Document
+
+from docx_hulp import alinea, docx
+from overzicht import maak_overzicht, verzamel, vul_overzicht_aan
+from profielen import compileer_profiel
+
+PROFIEL = compileer_profiel("Nieuw-West")
+TITEL = "Debriefingoverzicht Week 22"
+
+
+def formulier(datum, dienst, inzetgebied, *treffers):
+    return {"datum": datum, "dienst": dienst, "inzetgebied": inzetgebied}, list(treffers)
+
+
+# Week 22, zoals debriefings.py hem eerst met de oude formulieren maakt
+OUD = [
+    formulier("27-05-2025", "Ochtenddienst", "West", ("JEUGDOVERLAST", "Groep bij het plein"), ("AFVALPROBLEMATIEK", "Zakken naast de container")),
+    formulier("29-05-2025", "Avonddienst", "Oost", ("JEUGDOVERLAST", "Scooters op de stoep\nAangesproken")),
+    formulier("31-05-2025", "Ochtenddienst", "West", ("taken en opvallendheden", "Rustig")),
+]
+# Nieuwe formulieren: een eerdere datum, dezelfde datum en dienst als een bestaande kop,
+# een dienst later op een bestaande dag, een nieuwe categorie en een dubbele observatie
+NIEUW = [
+    formulier("26-05-2025", "Avonddienst", "Centrum", ("JEUGDOVERLAST", "Vuurwerk afgestoken")),
+    formulier("29-05-2025", "Avonddienst", "Noord", ("JEUGDOVERLAST", "Hangplek gecontroleerd")),
+    formulier("27-05-2025", "Avonddienst", "West", ("AFVALPROBLEMATIEK", "Grofvuil op straat")),
+    formulier("28-05-2025", "Tussendienst", "Oost", ("parkeeroverlast", "Auto's op de stoep")),
+    formulier("31-05-2025", "Ochtenddienst", "West", ("taken en opvallendheden", "rustig")),
+]
+
+
+def resultaten(per_bestand):
+    namen = [f"formulier_{i}.docx" for i in range(len(per_bestand))]
+    return verzamel(PROFIEL, per_bestand, namen)
+
+
+def alineas(data):
+    return [(p.style.name, p.text) for p in Document(BytesIO(data)).paragraphs]
+
+
+def overzicht(per_bestand):
+    return maak_overzicht(PROFIEL, "per_categorie", resultaten(per_bestand), TITEL, "sjabloon", dagnaam=False).naar_bytes()
+
+
+def aanvullen(bestaand, nieuw, eerder=OUD, weergave="per_categorie"):
+    # Zoals debriefings.py: alles verzamelen (wat er al in staat eerst), alleen de
+    # observaties uit de nieuwe formulieren schrijven
+    alles = resultaten(eerder + nieuw)
+    namen = {f"formulier_{len(eerder) + i}.docx" for i in range(len(nieuw))}
+    nieuwe = {cat: [obs for obs in items if obs.bestand in namen] for cat, items in alles.items()}
+    return vul_overzicht_aan(PROFIEL, weergave, bestaand, nieuwe, dagnaam=False).naar_bytes()
+
+
+def test_aangevuld_overzicht_is_gelijk_aan_opnieuw_maken():
+    aangevuld = aanvullen(overzicht(OUD), NIEUW)
+    assert alineas(aangevuld) == alineas(overzicht(OUD + NIEUW))
+
+
+def test_een_voor_een_aanvullen():
+    bestaand = overzicht(OUD)
+    for i, volgend in enumerate(NIEUW):
+        bestaand = aanvullen(bestaand, [volgend], eerder=OUD + NIEUW[:i])
+    assert alineas(bestaand) == alineas(overzicht(OUD + NIEUW))
+
+
+def test_de_rest_van_het_document_blijft_gelijk():
+    bestaand = overzicht(OUD)
+    aangevuld = aanvullen(bestaand, NIEUW[:1])
+    with zipfile.ZipFile(BytesIO(bestaand)) as oud, zipfile.ZipFile(BytesIO(aangevuld)) as nieuw:
+        assert oud.namelist() == nieuw.namelist()
+        for naam in oud.namelist():
+            if naam != "word/document.xml":
+                assert oud.read(naam) == nieuw.read(naam)
+
+
+def test_niets_nieuw_geeft_hetzelfde_overzicht():
+    bestaand = overzicht(OUD)
+    assert alineas(aanvullen(bestaand, [])) == alineas(bestaand)
+
+
+@pytest.mark.parametrize("weergave", ["per_datum_inzetgebied", "per_datum_categorie", "per_categorie_inzetgebied"])
+def test_andere_weergaven_worden_opnieuw_gemaakt(weergave):
+    with pytest.raises(ValueError):
+        aanvullen(overzicht(OUD), NIEUW, weergave=weergave)
+
+
+def _in_word_bewaard(data):
+    # Word zet rsid-attributen op de alinea's
+    buffer = BytesIO()
+    with zipfile.ZipFile(BytesIO(data)) as oud, zipfile.ZipFile(buffer, "w") as nieuw:
+        for info in oud.infolist():
+            inhoud = oud.read(info)
+            if info.filename == "word/document.xml":
+                inhoud = inhoud.replace(b"<w:p>", b'<w:p w:rsidR="00A1B2C3">')
+            nieuw.writestr(info, inhoud)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("bestaand", [
+    pytest.param(lambda: _in_word_bewaard(overzicht(OUD)), id="in-word-bewaard"),
+    pytest.param(lambda: docx(alinea("Debriefingsformulier")), id="ander-document"),
+    pytest.param(lambda: b"geen docx", id="geen-zip"),
+])
+def test_document_dat_hier_niet_geschreven_is(bestaand):
+    with pytest.raises(ValueError):
+        aanvullen(bestaand(), NIEUW)
@@ -0,0 +1,50 @@
+import re
+
+import pytest
+
+from categorie_matcher import CategorieMatcher
+
+
+def los_zoeken(categorieen, tekst):
+    # Zoals vroeger: elke categorie apart, als los woord, hoofdletterongevoelig
+    return [cat for cat in categorieen if re.search(r"\b" + re.escape(cat) + r"\b", tekst, re.IGNORECASE)]
+
+
+def test_categorie_als_los_woord():
+    matcher = CategorieMatcher(["JEUGDOVERLAST", "AFVALPROBLEMATIEK"])
+    assert matcher.zoek("Jeugdoverlast (hangjongeren)") == ["JEUGDOVERLAST"]
+    assert matcher.zoek("jeugdoverlastmelding") == []
+
+
+def test_volgorde_van_de_categorielijst():
+    matcher = CategorieMatcher(["parkeeroverlast", "JEUGDOVERLAST"])
+    assert matcher.zoek("JEUGDOVERLAST en parkeeroverlast") == ["parkeeroverlast", "JEUGDOVERLAST"]
+
+
+def test_categorie_die_met_een_andere_begint():
+    # "OVERLAST" op dezelfde plek als "OVERLAST PERSONEN": allebei gevonden
+    matcher = CategorieMatcher(["OVERLAST", "OVERLAST PERSONEN"])
+    assert matcher.zoek("Overlast personen") == ["OVERLAST", "OVERLAST PERSONEN"]
+    assert matcher.zoek("Overlast") == ["OVERLAST"]
+
+
+def test_categorie_binnen_een_langere():
+    matcher = CategorieMatcher(["PERSONEN", "OVERLAST PERSONEN", "TAKEN"])
+    assert matcher.zoek("Overlast personen") == ["PERSONEN", "OVERLAST PERSONEN"]
+    assert matcher.zoek("Overlast personeel") == []
+
+
+def test_overlappende_categorieen():
+    # De langere wint op de startpositie, de overlappende wordt toch gevonden
+    matcher = CategorieMatcher(["TAKEN EN", "EN OPVALLENDHEDEN"])
+    assert matcher.zoek("Taken en opvallendheden") == ["TAKEN EN", "EN OPVALLENDHEDEN"]
+
+
+@pytest.mark.parametrize("tekst", [
+    "OVERLAST PERSONEN", "overlast personen en jeugdoverlast", "Taken en opvallendheden",
+    "Overlast van personen", "AFVAL", "afvalproblematiek; parkeeroverlast", "",
+])
+def test_zelfde_als_elke_categorie_apart(tekst):
+    categorieen = ["OVERLAST PERSONEN", "OVERLAST", "PERSONEN", "JEUGDOVERLAST", "AFVAL",
+                   "AFVALPROBLEMATIEK", "parkeeroverlast", "taken en opvallendheden", "EN"]
+    assert CategorieMatcher(categorieen).zoek(tekst) == los_zoeken(categorieen, tekst)
@@ -0,0 +1,121 @@
+import zipfile
+from io import BytesIO
+
+import pytest
+from lxml import etree
+
+from docx_extractie import W, _rij_cellen, extraheer_formulier, zip_aantal, zip_formulieren
+from docx_hulp import alinea, cel, datumkiezer, docx, document_xml, formulier, rij, tabel
+
+CATEGORIEEN = ["OVERLAST PERSONEN", "JEUGDOVERLAST", "AFVALPROBLEMATIEK"]
+
+
+def _rij(xml):
+    return etree.fromstring(f'<w:tbl xmlns:w="{W[1:-1]}">{xml}</w:tbl>')[0]
+
+
+def lees(data, **opties):
+    return extraheer_formulier(BytesIO(data), CATEGORIEEN, **opties)
+
+
+# -------------------------------
+# Cellen in het tabelraster
+# -------------------------------
+def test_grid_before_en_grid_span_geven_de_kolom():
+    cellen, _ = _rij_cellen(_rij(rij(cel("a", span=2), cel("b"), grid_before=1)), {})
+    assert cellen == [(1, 2, "a"), (3, 1, "b")]
+
+
+def test_v_merge_neemt_de_tekst_van_de_cel_erboven_over():
+    _, vorige = _rij_cellen(_rij(rij(cel("Locatie", v_merge="restart"), cel("Oost"))), {})
+    cellen, _ = _rij_cellen(_rij(rij(cel("", v_merge="continue"), cel("West"))), vorige)
+    assert cellen == [(0, 1, "Locatie"), (1, 1, "West")]
+
+
+def test_v_merge_volgt_de_kolom_na_grid_before():
+    _, vorige = _rij_cellen(_rij(rij(cel("x"), cel("boven", v_merge="restart"))), {})
+    cellen, _ = _rij_cellen(_rij(rij(cel("", v_merge="continue"), grid_before=1)), vorige)
+    assert cellen == [(1, 1, "boven")]
+
+
+# -------------------------------
+# Kopvelden en antwoorden
+# -------------------------------
+def test_formulier_met_samengevoegde_cellen():
+    data = docx(
+        tabel(
+            rij(cel("Datum dienst"), cel("31-05-2025")),
+            rij(cel("Soort dienst", span=2), cel("Avonddienst")),
+            rij(cel("Inzetgebied"), cel("Oost"), grid_before=1),
+        ),
+        tabel(
+            rij(cel("Jeugdoverlast", span=2)),
+            rij(cel("Groep bij het plein\nDoorgestuurd", span=2)),
+            rij(cel("Afvalproblematiek", span=2)),
+            rij(cel("", span=2)),
+        ),
+    )
+    velden, treffers = lees(data)
+    assert velden == {"datum": "31-05-2025", "dienst": "Avonddienst", "inzetgebied": "Oost"}
+    # Een lege antwoordrij geeft geen treffer
+    assert treffers == [("JEUGDOVERLAST", "Groep bij het plein\nDoorgestuurd")]
+
+
+def test_datum_dienst_gaat_voor_de_datumkiezer():
+    data = docx(
+        tabel(rij(cel("Datum dienst"), cel("31-05-2025"))),
+        datumkiezer("01-06-2025"),
+    )
+    assert lees(data)[0]["datum"] == "31-05-2025"
+    data = docx(tabel(rij(cel("Soort dienst"), cel("Ochtenddienst"))), datumkiezer("01-06-2025"))
+    assert lees(data)[0]["datum"] == "01-06-2025"
+
+
+# -------------------------------
+# Alleen de gekozen week
+# -------------------------------
+def test_formulier_in_de_week_wordt_helemaal_gelezen():
+    data = formulier("31-05-2025", "Ochtenddienst", "West", [("Jeugdoverlast", "Rustig")])
+    assert lees(data, week=(2025, 22)) == lees(data)
+
+
+def test_buiten_de_week_stopt_het_lezen_na_de_kop_tabel():
+    # Na de kop-tabel is het document kapot: dat wordt alleen gelezen zonder weekfilter
+    kop = tabel(rij(cel("Datum dienst"), cel("31-05-2025")))
+    xml = document_xml(kop).replace("</w:body></w:document>", "<w:tbl><w:tr><w:tc>")
+    data = docx(xml=xml)
+
+    velden, treffers = lees(data, week=(2025, 23))
+    assert velden["datum"] == "31-05-2025"
+    assert treffers is None
+    with pytest.raises(etree.XMLSyntaxError):
+        lees(data)
+
+
+def test_datumkiezer_beslist_na_de_eerste_tabel():
+    kop = tabel(rij(cel("Soort dienst"), cel("Avonddienst")))
+    xml = document_xml(kop, alinea("Datum:"), datumkiezer("02-06-2025"))
+    xml = xml.replace("</w:body></w:document>", "<w:tbl><w:tr><w:tc>")
+    velden, treffers = lees(docx(xml=xml), week=(2025, 22))
+    assert (velden["datum"], treffers) == ("02-06-2025", None)
+
+
+def test_onleesbare_datum_telt_als_binnen_de_week():
+    data = formulier("ergens in juni", "Ochtenddienst", "West", [("Jeugdoverlast", "Rustig")])
+    assert lees(data, week=(2025, 22))[1] == [("JEUGDOVERLAST", "Rustig")]
+
+
+# -------------------------------
+# Zips
+# -------------------------------
+def test_zip_slaat_overzichten_en_andere_bestanden_over():
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archief:
+        archief.writestr("Week 22/b.docx", formulier("31-05-2025", "Ochtenddienst", "West", []))
+        archief.writestr("Week 22/a.docx", formulier("30-05-2025", "Avonddienst", "Oost", []))
+        archief.writestr("Week 22/Week 22 Debriefingsoverzicht.docx", docx(alinea("Overzicht")))
+        archief.writestr("Week 22/~$a.docx", b"")
+        archief.writestr("__MACOSX/Week 22/._a.docx", b"")
+        archief.writestr("Week 22/notities.txt", b"")
+    assert zip_aantal(buffer) == 2
+    assert [naam for naam, _ in zip_formulieren(buffer)] == ["a.docx", "b.docx"]
@@ -0,0 +1,22 @@
+import json
+
+from meting import Meting
+
+
+def test_bestanden_met_dezelfde_naam_blijven_apart():
+    # Twee zips met elk een "Debriefing.docx"
+    meting = Meting("test")
+    meting.voeg_bestanden_toe(
+        ["Debriefing.docx", "a.docx", "Debriefing.docx", "b.docx"],
+        [{"xml": 0.9}, {"xml": 0.1}, {"xml": 0.2}, {"xml": 0.1}],
+    )
+    assert [(i, naam) for i, naam, _, _ in meting.per_bestand()] == [
+        (0, "Debriefing.docx"), (2, "Debriefing.docx"), (1, "a.docx"), (3, "b.docx")
+    ]
+    assert meting.trage_bestanden() == [(0, "Debriefing.docx", 0.9)]
+
+    regels = [json.loads(regel) for regel in meting.json_regels()]
+    assert regels[0]["bestanden"] == 4
+    assert [(r["volgnummer"], r["bestand"]) for r in regels[1:]] == [
+        (0, "Debriefing.docx"), (2, "Debriefing.docx"), (1, "a.docx"), (3, "b.docx")
+    ]
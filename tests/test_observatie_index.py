@@ -0,0 +1,200 @@
+import sqlite3
+
+from docx_hulp import formulier
+from observatie_index import SCHEMA, ObservatieIndex, _voer_script_uit
+from profielen import compileer_profiel, profiel_sleutel
+
+PROFIEL = compileer_profiel("Nieuw-West")
+SLEUTEL = profiel_sleutel(PROFIEL.categorieen, PROFIEL.kopvelden)
+
+
+def velden(datum="31-05-2025", dienst="Ochtenddienst 07:00-15:30u", inzetgebied="West"):
+    return {"datum": datum, "dienst": dienst, "inzetgebied": inzetgebied}
+
+
+def toevoegen(index, naam, bestand_hash, treffers, **kop):
+    index.toevoegen(naam, bestand_hash, 100, velden(**kop), treffers, PROFIEL.categorieen, PROFIEL.kopvelden,
+                    onderdeel=PROFIEL.naam)
+
+
+def trends(index):
+    return index.conn.execute(
+        "SELECT categorie, iso_jaar, iso_week, inzetgebied, dagdeel, aantal FROM trends ORDER BY 1, 2, 3, 4, 5"
+    ).fetchall()
+
+
+def gevonden(index, zoekterm):
+    return sorted(r["tekst"] for r in index.zoek(zoekterm))
+
+
+# -------------------------------
+# Migraties
+# -------------------------------
+def test_migratie_van_versie_1(tmp_path):
+    pad = str(tmp_path / "observaties.sqlite")
+    conn = sqlite3.connect(pad)
+    with conn:
+        _voer_script_uit(conn, SCHEMA)
+        conn.execute("INSERT INTO bestanden VALUES ('Week22/a.docx', ?, 1, 100, 'hashA')", (SLEUTEL,))
+        conn.execute("INSERT INTO bestanden VALUES ('Week22/b.docx', ?, 1, 100, 'hashB')", (SLEUTEL,))
+        conn.execute("INSERT INTO bestanden VALUES ('Week22/leeg.docx', ?, 1, 100, 'hashC')", (SLEUTEL,))
+        conn.executemany(
+            "INSERT INTO observaties (hash, profiel, onderdeel, volgnummer, datum, dienst, inzetgebied, categorie, tekst) "
+            "VALUES (?, ?, 'Nieuw-West', ?, '31-05-2025', 'Avonddienst', 'Oost', 'JEUGDOVERLAST', ?)",
+            [("hashA", SLEUTEL, 0, "Scooters bij het Sierplein"), ("hashA", SLEUTEL, 1, "Groep aangesproken"),
+             ("hashB", SLEUTEL, 0, "groep aangesproken")],
+        )
+    conn.execute("PRAGMA user_version = 1")
+    conn.close()
+
+    with ObservatieIndex(pad) as index:
+        assert index.conn.execute("PRAGMA user_version").fetchone()[0] == 6
+        assert index.conn.execute("SELECT DISTINCT datum_iso, iso_jaar, iso_week, dagdeel FROM observaties").fetchall() == [
+            ("2025-05-31", 2025, 22, "avond")
+        ]
+        # Full-text index en trends zijn opgebouwd uit de bestaande observaties; de
+        # observatie die in beide formulieren staat telt één keer
+        assert gevonden(index, "sierplein") == ["Scooters bij het Sierplein"]
+        assert trends(index) == [("JEUGDOVERLAST", 2025, 22, "Oost", "avond", 2)]
+        assert index.overzicht_inhoud("Week22/overzicht.docx", SLEUTEL, "per_categorie", "Titel") is None
+        # Kopvelden per bestand; een formulier zonder observaties wordt opnieuw gelezen
+        assert index._velden("hashA", SLEUTEL) == {"datum": "31-05-2025", "dienst": "Avonddienst", "inzetgebied": "Oost"}
+        assert index.conn.execute("SELECT pad FROM bestanden ORDER BY pad").fetchall() == [
+            ("Week22/a.docx",), ("Week22/b.docx",)
+        ]
+
+    # Opnieuw openen migreert niets meer
+    with ObservatieIndex(pad) as index:
+        assert trends(index) == [("JEUGDOVERLAST", 2025, 22, "Oost", "avond", 2)]
+
+
+# -------------------------------
+# Triggers
+# -------------------------------
+def test_full_text_index_volgt_de_observaties(index):
+    toevoegen(index, "a.docx", "hashA", [("JEUGDOVERLAST", "Scooters bij het Sierplein")])
+    assert gevonden(index, "sierplein") == ["Scooters bij het Sierplein"]
+    assert gevonden(index, "sier*") == ["Scooters bij het Sierplein"]
+
+    # Opnieuw opslaan (gewijzigd formulier) vervangt de oude tekst ook in de index
+    with index.conn:
+        index._opslaan("hashA", SLEUTEL, PROFIEL.naam, velden(), [("JEUGDOVERLAST", "Hangplek gecontroleerd")])
+    assert gevonden(index, "sierplein") == []
+    assert gevonden(index, "hangplek") == ["Hangplek gecontroleerd"]
+
+
+def test_trends_tellen_mee_met_toevoegen_en_verwijderen(index):
+    toevoegen(index, "a.docx", "hashA", [("JEUGDOVERLAST", "a"), ("JEUGDOVERLAST", "b")], dienst="Avonddienst")
+    toevoegen(index, "b.docx", "hashB", [("JEUGDOVERLAST", "c")], dienst="Avonddienst")
+    toevoegen(index, "c.docx", "hashC", [("AFVALPROBLEMATIEK", "d")], datum="niet te lezen", inzetgebied=None)
+    assert trends(index) == [
+        ("AFVALPROBLEMATIEK", 0, 0, "", "ochtend", 1),
+        ("JEUGDOVERLAST", 2025, 22, "West", "avond", 3),
+    ]
+
+    with index.conn:
+        index.conn.execute("DELETE FROM observaties WHERE hash IN ('hashA', 'hashC')")
+    assert trends(index) == [("JEUGDOVERLAST", 2025, 22, "West", "avond", 1)]
+
+
+def test_zelfde_inhoud_telt_een_keer(index):
+    toevoegen(index, "a.docx", "hashA", [("JEUGDOVERLAST", "a")])
+    toevoegen(index, "kopie van a.docx", "hashA", [("JEUGDOVERLAST", "a")])
+    assert [rij[-1] for rij in trends(index)] == [1]
+
+
+def test_dubbele_observaties_tellen_een_keer_zoals_in_het_overzicht(index):
+    # Debriefingsformulier en dagrapport van dezelfde dienst, anders gespeld
+    toevoegen(index, "a.docx", "hashA", [("JEUGDOVERLAST", "Groep bij het plein"), ("JEUGDOVERLAST", "groep bij het plein")])
+    toevoegen(index, "b.docx", "hashB", [("JEUGDOVERLAST", "Groep  bij het PLEIN")], datum="31 mei 2025",
+              dienst="OCHTENDDIENST", inzetgebied="west")
+    toevoegen(index, "c.docx", "hashC", [("JEUGDOVERLAST", "Groep bij het plein")], inzetgebied="Oost")
+    assert trends(index) == [
+        ("JEUGDOVERLAST", 2025, 22, "Oost", "ochtend", 1),
+        ("JEUGDOVERLAST", 2025, 22, "West", "ochtend", 1),
+    ]
+
+    # De getelde verdwijnt: de dubbele uit b telt nu, in zijn eigen groep
+    with index.conn:
+        index.conn.execute("DELETE FROM observaties WHERE hash = 'hashA'")
+    assert trends(index) == [
+        ("JEUGDOVERLAST", 2025, 22, "Oost", "ochtend", 1),
+        ("JEUGDOVERLAST", 2025, 22, "west", "ochtend", 1),
+    ]
+    with index.conn:
+        index.conn.execute("DELETE FROM observaties WHERE hash IN ('hashB', 'hashC')")
+    assert trends(index) == []
+
+
+# -------------------------------
+# Bijwerken en opruimen
+# -------------------------------
+def schrijf(map_, naam, *antwoorden, datum="31-05-2025"):
+    pad = map_ / naam
+    pad.write_bytes(formulier(datum, "Ochtenddienst", "West", [("Jeugdoverlast", tekst) for tekst in antwoorden]))
+    return str(pad)
+
+
+def bijwerken(index, paden, mappen=None):
+    return index.bijwerken(paden, PROFIEL.categorieen, PROFIEL.kopvelden, onderdeel=PROFIEL.naam, workers=1,
+                           mappen=mappen)
+
+
+def test_bijwerken_geeft_dezelfde_observaties_als_de_extractie(index, tmp_path):
+    paden = [schrijf(tmp_path, "a.docx", "Rustig"), schrijf(tmp_path, "b.docx", "Scooters")]
+    eerst = bijwerken(index, paden)
+    assert [treffers for _, treffers in eerst] == [[("JEUGDOVERLAST", "Rustig")], [("JEUGDOVERLAST", "Scooters")]]
+    # De tweede keer uit de index
+    assert bijwerken(index, paden) == eerst
+
+
+def test_kopvelden_ook_zonder_observaties(index, tmp_path):
+    leeg = tmp_path / "leeg.docx"
+    leeg.write_bytes(formulier("31-05-2025", "Avonddienst", "Oost", [("Jeugdoverlast", "")]))
+    kopie = tmp_path / "kopie.docx"
+    kopie.write_bytes(leeg.read_bytes())
+    verwacht = [({"datum": "31-05-2025", "dienst": "Avonddienst", "inzetgebied": "Oost"}, [])]
+    assert bijwerken(index, [str(leeg)]) == verwacht
+    # Uit de index, en voor dezelfde inhoud onder een andere naam
+    assert bijwerken(index, [str(leeg)]) == verwacht
+    assert bijwerken(index, [str(kopie)]) == verwacht
+
+
+def test_verwijderd_of_gewijzigd_formulier_verdwijnt_uit_zoeken_en_trends(index, tmp_path):
+    week = tmp_path / "Week22"
+    week.mkdir()
+    a = schrijf(week, "a.docx", "Scooters bij het Sierplein")
+    b = schrijf(week, "b.docx", "Hangplek gecontroleerd")
+    bijwerken(index, [a, b])
+    assert [rij[-1] for rij in trends(index)] == [2]
+
+    # b verwijderd, a gewijzigd
+    (week / "b.docx").unlink()
+    schrijf(week, "a.docx", "Geen bijzonderheden")
+    bijwerken(index, [a])
+    assert gevonden(index, "hangplek") == []
+    assert gevonden(index, "sierplein") == []
+    assert gevonden(index, "bijzonderheden") == ["Geen bijzonderheden"]
+    assert [rij[-1] for rij in trends(index)] == [1]
+
+
+def test_opruimen_laat_andere_mappen_en_uploads_staan(index, tmp_path):
+    (tmp_path / "Week21").mkdir()
+    (tmp_path / "Week22").mkdir()
+    bijwerken(index, [schrijf(tmp_path / "Week21", "a.docx", "Week 21", datum="22-05-2025")])
+    toevoegen(index, "rapport.docx", "upload1", [("JEUGDOVERLAST", "Eerste upload")])
+    toevoegen(index, "rapport.docx", "upload2", [("JEUGDOVERLAST", "Tweede upload")])
+
+    bijwerken(index, [schrijf(tmp_path / "Week22", "b.docx", "Week 22")])
+    assert gevonden(index, "week") == ["Week 21", "Week 22"]
+    assert gevonden(index, "upload") == ["Eerste upload", "Tweede upload"]
+
+
+def test_lege_map_wordt_opgeruimd(index, tmp_path):
+    week = tmp_path / "Week22"
+    week.mkdir()
+    bijwerken(index, [schrijf(week, "a.docx", "Scooters bij het Sierplein")], mappen=[str(week)])
+    (week / "a.docx").unlink()
+    bijwerken(index, [], mappen=[str(week)])
+    assert gevonden(index, "sierplein") == []
+    assert trends(index) == []
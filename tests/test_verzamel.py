@@ -0,0 +1,57 @@
+from overzicht import verzamel
+from profielen import compileer_profiel
+
+PROFIEL = compileer_profiel("Nieuw-West")
+
+
+def velden(datum="31-05-2025", dienst="Ochtenddienst 07:00-15:30u", inzetgebied="West"):
+    return {"datum": datum, "dienst": dienst, "inzetgebied": inzetgebied}
+
+
+def teksten(resultaten):
+    return [(obs.categorie, obs.tekst, obs.bestand) for items in resultaten.values() for obs in items]
+
+
+def test_dezelfde_observatie_anders_gespeld_komt_er_een_keer_in():
+    per_bestand = [
+        (velden(), [("JEUGDOVERLAST", "Groep bij het plein")]),
+        (velden(datum="31 mei 2025", dienst="OCHTENDDIENST"), [("JEUGDOVERLAST", "  groep  bij het PLEIN ")]),
+    ]
+    dubbelen = []
+    resultaten = verzamel(PROFIEL, per_bestand, ["a.docx", "b.docx"], dubbelen)
+    assert teksten(resultaten) == [("JEUGDOVERLAST", "Groep bij het plein", "a.docx")]
+    assert [(obs.bestand, obs.tekst) for obs in dubbelen] == [("b.docx", "  groep  bij het PLEIN ")]
+
+
+def test_ander_inzetgebied_dagdeel_dag_of_categorie_blijft_staan():
+    per_bestand = [
+        (velden(), [("JEUGDOVERLAST", "Geen bijzonderheden")]),
+        (velden(inzetgebied="Oost"), [("JEUGDOVERLAST", "Geen bijzonderheden")]),
+        (velden(dienst="Avonddienst"), [("JEUGDOVERLAST", "Geen bijzonderheden")]),
+        (velden(datum="01-06-2025"), [("JEUGDOVERLAST", "Geen bijzonderheden")]),
+        (velden(), [("AFVALPROBLEMATIEK", "Geen bijzonderheden")]),
+    ]
+    dubbelen = []
+    resultaten = verzamel(PROFIEL, per_bestand, dubbelen=dubbelen)
+    assert len(teksten(resultaten)) == 5
+    assert dubbelen == []
+
+
+def test_dubbel_binnen_een_formulier_en_zonder_treffers():
+    per_bestand = [
+        (velden(), [("JEUGDOVERLAST", "Rustig"), ("JEUGDOVERLAST", "rustig")]),
+        (velden(), None),
+        (velden(), []),
+    ]
+    dubbelen = []
+    assert teksten(verzamel(PROFIEL, per_bestand, dubbelen=dubbelen)) == [("JEUGDOVERLAST", "Rustig", None)]
+    assert len(dubbelen) == 1
+
+
+def test_onbekende_datum_en_dienst_vergelijken_op_tekst():
+    per_bestand = [
+        (velden(datum="zaterdag", dienst="Extra inzet"), [("JEUGDOVERLAST", "Rustig")]),
+        (velden(datum="Zaterdag ", dienst="extra  inzet"), [("JEUGDOVERLAST", "Rustig")]),
+        (velden(datum="zondag", dienst="Extra inzet"), [("JEUGDOVERLAST", "Rustig")]),
+    ]
+    assert len(teksten(verzamel(PROFIEL, per_bestand))) == 2